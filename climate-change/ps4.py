@@ -1,5 +1,4 @@
 import numpy as np
-import pylab
 import re
 
 # cities in our weather data
@@ -185,6 +184,7 @@ def evaluate_models_on_training(x, y, models):
     Returns:
         None
     """
+    import pylab
     xVals = np.array(x)
     yVals = np.array(y)
    
@@ -200,27 +200,31 @@ def evaluate_models_on_training(x, y, models):
         
 
 ### Begining of program
-raw_data = Climate('data.csv')
-
-# Problem 3
-x = INTERVAL_1
-y = []
-for year in INTERVAL_1:
-   y.append(raw_data.get_daily_temp('BOSTON', 1, 10, year))
-models = generate_models(x, y, [1])
-evaluate_models_on_training(x, y, models)
-
-
-# Problem 4: FILL IN MISSING CODE TO GENERATE y VALUES
-x1 = INTERVAL_1
-x2 = INTERVAL_2
-y = []
-for year in INTERVAL_1:
-    y.append(np.mean(raw_data.get_yearly_temp('BOSTON', year)))
-models = generate_models(x1, y, [1])    
-evaluate_models_on_training(x1, y, models)
+def main(filename='data.csv'):
+    """
+    Fits and plots the models of problems 3 and 4 to the temperatures in
+    Boston read from the given data file.
+    """
+    raw_data = Climate(filename)
 
+    # Problem 3
+    x = INTERVAL_1
+    y = []
+    for year in INTERVAL_1:
+       y.append(raw_data.get_daily_temp('BOSTON', 1, 10, year))
+    models = generate_models(x, y, [1])
+    evaluate_models_on_training(x, y, models)
 
 
+    # Problem 4: FILL IN MISSING CODE TO GENERATE y VALUES
+    x1 = INTERVAL_1
+    x2 = INTERVAL_2
+    y = []
+    for year in INTERVAL_1:
+        y.append(np.mean(raw_data.get_yearly_temp('BOSTON', year)))
+    models = generate_models(x1, y, [1])    
+    evaluate_models_on_training(x1, y, models)
 
 
+if __name__ == '__main__':
+    main()
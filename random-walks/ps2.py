@@ -2,8 +2,8 @@
 
 import math
 import random
+import statistics
 #import ps2_visualize
-import pylab
 import numpy as np
 
 ##################
@@ -23,6 +23,8 @@ class Position(object):
     """
     A Position represents a location in a two-dimensional room.
     """
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y):
         """
         Initializes a position with coordinates (x, y).
@@ -60,6 +62,40 @@ class Position(object):
         return "(%0.2f, %0.2f)" % (self.x, self.y)
 
 
+# the moves of a single clock-tick in the 360 integer directions, by speed,
+# as lists and as arrays
+stepTables = {}
+stepArrays = {}
+
+def directionSteps(speed):
+    """
+    Return the changes in x and in y of a single clock-tick at the given speed
+    in every integer direction, the same numbers Position.getNewPosition
+    computes. The tables are computed once per speed.
+    speed: positive float representing speed
+    returns: a pair of lists of 360 floats, indexed by the angle in degrees
+    """
+    steps = stepTables.get(speed)
+    if steps is None:
+        steps = ([speed * math.sin(math.radians(float(angle))) for angle in range(360)],
+                 [speed * math.cos(math.radians(float(angle))) for angle in range(360)])
+        stepTables[speed] = steps
+    return steps
+
+def validDirections(x, y, width, height, speed):
+    """
+    Return the integer directions in which a single clock-tick at the given
+    speed from (x, y) stays inside a room of dimensions WIDTH x HEIGHT.
+    returns: an array of angles in degrees
+    """
+    steps = stepArrays.get(speed)
+    if steps is None:
+        steps = stepArrays[speed] = tuple(map(np.array, directionSteps(speed)))
+    stepX, stepY = steps
+    return np.flatnonzero((stepX >= -x) & (stepX < width - x)
+                          & (stepY >= -y) & (stepY < height - y))
+
+
 # === Problem 1
 class RectangularRoom(object):
     """
@@ -67,6 +103,8 @@ class RectangularRoom(object):
     tiles.
     A room has a width and a height and contains (width * height) tiles. At any
     particular time, each of these tiles is either clean or dirty.
+    The tiles are kept in a bytearray, one byte per tile, column after column:
+    tile (m, n) is byte m * height + n.
     """
     def __init__(self, width, height):
         """
@@ -78,7 +116,7 @@ class RectangularRoom(object):
         self.width = width
         self.height = height
         self.numCleanTiles = 0
-        self.roomTiles = [[0 for x in range(height)] for y in range(width)]
+        self.tiles = bytearray(width * height)
 
     def cleanTileAtPosition(self, pos):
         """
@@ -86,10 +124,11 @@ class RectangularRoom(object):
         Assumes that POS represents a valid position inside this room.
         pos: a Position
         """
-        if self.isTileCleaned(math.floor(pos.x), math.floor(pos.y)):
-            return
-        self.roomTiles[math.floor(pos.x)][math.floor(pos.y)] = 1
-        self.numCleanTiles += 1
+        # positions in the room are not negative, so int() is math.floor()
+        tile = int(pos.x) * self.height + int(pos.y)
+        if not self.tiles[tile]:
+            self.tiles[tile] = 1
+            self.numCleanTiles += 1
 
     def isTileCleaned(self, m, n):
         """
@@ -99,10 +138,29 @@ class RectangularRoom(object):
         n: an integer
         returns: True if (m, n) is cleaned, False otherwise
         """
-        if self.roomTiles[m][n] == 1:
-            return True
-        else:
-            return False
+        return self.tiles[m * self.height + n] == 1
+
+    def cleanTiles(self, tiles):
+        """
+        Mark many tiles as cleaned at once, for the engines that move all the
+        robots together.
+        tiles: an array of tile numbers m * height + n, possibly repeated
+        returns: the number of tiles that were not clean before
+        """
+        view = np.frombuffer(self.tiles, dtype=np.uint8)
+        tiles = np.unique(tiles)
+        cleaned = len(tiles) - int(view[tiles].sum())
+        view[tiles] = 1
+        self.numCleanTiles += cleaned
+        return cleaned
+
+    def areTilesCleaned(self, tiles):
+        """
+        Return whether each of many tiles has been cleaned.
+        tiles: an array of tile numbers m * height + n
+        returns: an array of bools
+        """
+        return np.frombuffer(self.tiles, dtype=np.uint8)[tiles] == 1
     
     def getNumTiles(self):
         """
@@ -138,29 +196,186 @@ class RectangularRoom(object):
 
 
 #TESTING
-room = RectangularRoom(4, 5)
+#room = RectangularRoom(4, 5)
 #print ('Number of tiles in the room is ' + str(room.getNumTiles()))
 
-pos1 = Position(0.6, 1.3)
-room.cleanTileAtPosition(pos1)
+#pos1 = Position(0.6, 1.3)
+#room.cleanTileAtPosition(pos1)
 #print (room.isTileCleaned(0,1))
 
-pos2 = Position(3.5, 4.5) 
-room.cleanTileAtPosition(pos2)
+#pos2 = Position(3.5, 4.5) 
+#room.cleanTileAtPosition(pos2)
 #print (room.isTileCleaned(3,4))
 
-pos3 = Position(3.99, 4.99)
-room.cleanTileAtPosition(pos3)
+#pos3 = Position(3.99, 4.99)
+#room.cleanTileAtPosition(pos3)
 #print (room.isTileCleaned(3,4))
 
 #print (room.isTileCleaned(1,2))
 #print (room.getNumCleanedTiles())
 
-pos4 = room.getRandomPosition()
+#pos4 = room.getRandomPosition()
 #print ("Random position in the room " + str(pos4))
 #print (room.isPositionInRoom(pos4))
 
 
+# the number of bits set in every byte
+byteBits = np.array([bin(byte).count('1') for byte in range(256)],
+                    dtype=np.uint8)
+
+def popcount(bits):
+    """
+    Return the number of bits set in an array of uint8, a slice at a time so
+    that even a huge bitset needs little memory to count.
+    """
+    bits = np.asarray(bits, dtype=np.uint8).ravel()
+    return sum(int(byteBits[bits[i:i + (1 << 22)]].sum(dtype=np.int64))
+               for i in range(0, len(bits), 1 << 22))
+
+def setBits(bits, numbers):
+    """
+    Set the bits NUMBERS of the array of uint8 BITS, bit k being bit k % 8 of
+    byte k // 8.
+    returns: the number of those bits that were not set before
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    byte = numbers >> 3
+    touched = np.unique(byte)
+    before = popcount(bits[touched])
+    np.bitwise_or.at(bits, byte, np.left_shift(1, numbers & 7).astype(np.uint8))
+    return popcount(bits[touched]) - before
+
+
+class BitsetRoom(RectangularRoom):
+    """
+    A RectangularRoom with a bit for every tile instead of a byte, so that a
+    room eight times larger fits in the same memory: 50000 x 50000 tiles take
+    about 300 MB. Tile (m, n) is bit m * height + n of the bitset.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.numCleanTiles = 0
+        self.bits = bytearray(-(-width * height // 8))
+
+    def cleanTileAtPosition(self, pos):
+        tile = int(pos.x) * self.height + int(pos.y)
+        mask = 1 << (tile & 7)
+        if not self.bits[tile >> 3] & mask:
+            self.bits[tile >> 3] |= mask
+            self.numCleanTiles += 1
+
+    def isTileCleaned(self, m, n):
+        tile = m * self.height + n
+        return self.bits[tile >> 3] >> (tile & 7) & 1 == 1
+
+    def cleanTiles(self, tiles):
+        cleaned = setBits(np.frombuffer(self.bits, dtype=np.uint8), tiles)
+        self.numCleanTiles += cleaned
+        return cleaned
+
+    def areTilesCleaned(self, tiles):
+        tiles = np.asarray(tiles, dtype=np.int64)
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        return (bits[tiles >> 3] >> (tiles & 7) & 1) == 1
+
+    def countCleanedTiles(self):
+        """
+        Return the number of clean tiles counted from the bitset, which is
+        always getNumCleanedTiles().
+        """
+        return popcount(np.frombuffer(self.bits, dtype=np.uint8))
+
+
+class SparseRoom(RectangularRoom):
+    """
+    A RectangularRoom that keeps only the blocks of BLOCK x BLOCK tiles in
+    which a tile was cleaned, each as a bitset, so that a huge room only
+    takes memory for the part of it the robots have been to. Tile (m, n) is
+    bit (m % BLOCK) * BLOCK + n % BLOCK of block
+    (m // BLOCK) * ceil(height / BLOCK) + n // BLOCK.
+    """
+    BLOCK = 64
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.numCleanTiles = 0
+        self.blocksHigh = -(-height // self.BLOCK)
+        self.blocks = {}
+
+    def cleanTileAtPosition(self, pos):
+        m, n = int(pos.x), int(pos.y)
+        size = self.BLOCK
+        key = m // size * self.blocksHigh + n // size
+        block = self.blocks.get(key)
+        if block is None:
+            block = self.blocks[key] = bytearray(size * size // 8)
+        bit = m % size * size + n % size
+        mask = 1 << (bit & 7)
+        if not block[bit >> 3] & mask:
+            block[bit >> 3] |= mask
+            self.numCleanTiles += 1
+
+    def isTileCleaned(self, m, n):
+        size = self.BLOCK
+        block = self.blocks.get(m // size * self.blocksHigh + n // size)
+        bit = m % size * size + n % size
+        return block is not None and block[bit >> 3] >> (bit & 7) & 1 == 1
+
+    def blockBits(self, tiles):
+        """
+        Group many tiles by block.
+        tiles: an array of tile numbers m * height + n
+        returns: a list of the key of every block with some of the tiles,
+        the indices of those tiles in TILES and their bits in the block
+        """
+        size = self.BLOCK
+        tiles = np.asarray(tiles, dtype=np.int64)
+        m = tiles // self.height
+        n = tiles % self.height
+        keys = m // size * self.blocksHigh + n // size
+        order = np.argsort(keys, kind='stable')
+        bits = (m % size * size + n % size)[order]
+        keys = keys[order]
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        ends = np.append(starts[1:], len(keys))
+        return [(int(keys[start]), order[start:end], bits[start:end])
+                for start, end in zip(starts, ends)]
+
+    def cleanTiles(self, tiles):
+        size = self.BLOCK
+        cleaned = 0
+        for key, index, bits in self.blockBits(tiles):
+            block = self.blocks.get(key)
+            if block is None:
+                block = self.blocks[key] = bytearray(size * size // 8)
+            cleaned += setBits(np.frombuffer(block, dtype=np.uint8), bits)
+        self.numCleanTiles += cleaned
+        return cleaned
+
+    def areTilesCleaned(self, tiles):
+        clean = np.zeros(len(tiles), dtype=bool)
+        for key, index, bits in self.blockBits(tiles):
+            block = self.blocks.get(key)
+            if block is not None:
+                block = np.frombuffer(block, dtype=np.uint8)
+                clean[index] = (block[bits >> 3] >> (bits & 7) & 1) == 1
+        return clean
+
+    def countCleanedTiles(self):
+        """
+        Return the number of clean tiles counted from the blocks, which is
+        always getNumCleanedTiles().
+        """
+        return sum(popcount(np.frombuffer(block, dtype=np.uint8))
+                   for block in self.blocks.values())
+
+#room = SparseRoom(50000, 50000)
+#room.cleanTileAtPosition(Position(31234.5, 4.2))
+#print(room.isTileCleaned(31234, 4), room.getNumCleanedTiles(), len(room.blocks))
+
+
 
 # === Problem 2
 class Robot(object):
@@ -181,6 +396,7 @@ class Robot(object):
         """
         self.room  = room
         self.speed = speed
+        self.stepX, self.stepY = directionSteps(speed)
         self.direction = random.randrange(0,360,1)
         self.position = room.getRandomPosition()
         self.room.cleanTileAtPosition(self.position)
@@ -188,9 +404,11 @@ class Robot(object):
     def getRobotPosition(self):
         """
         Return the position of the robot.
+        The robot moves its own position in place, so this is a copy that
+        stays where the robot was when it was asked.
         returns: a Position object giving the robot's position.
         """
-        return self.position
+        return Position(self.position.x, self.position.y)
     
     def getRobotDirection(self):
         """
@@ -203,9 +421,10 @@ class Robot(object):
     def setRobotPosition(self, position):
         """
         Set the position of the robot to POSITION.
+        The robot keeps a copy, since it moves its position in place.
         position: a Position object.
         """
-        self.position = position
+        self.position = Position(position.getX(), position.getY())
 
     def setRobotDirection(self, direction):
         """
@@ -222,8 +441,59 @@ class Robot(object):
         """
         raise NotImplementedError       # don't change this!
 
+    def turnAway(self, tries=4):
+        """
+        Choose new directions at random until the move of a time-step stays in
+        the room, and set the robot's direction to it.
+        After TRIES random directions that all leave the room, the new
+        direction is drawn from the list of directions that stay in it, which
+        picks every valid direction with the same probability as drawing
+        until one fits, without spinning in a corner.
+        tries: the number of random directions to try before that
+        returns: the new direction
+        """
+        pos = self.position
+        room = self.room
+        while True:
+            # change direction randomly
+            if tries > 0:
+                tries -= 1
+                direction = random.randrange(360)
+            else:
+                valid = validDirections(pos.x, pos.y, room.width, room.height, self.speed)
+                if len(valid) == 0:
+                    raise ValueError('the robot cannot move without leaving the room')
+                direction = int(valid[random.randrange(len(valid))])
+            x = pos.x + self.stepX[direction]
+            y = pos.y + self.stepY[direction]
+            if 0 <= x < room.width and 0 <= y < room.height:
+                self.direction = direction
+                return direction
+
+    def moveAndClean(self):
+        """
+        Move the robot one time-step in its direction, choosing a new
+        direction with turnAway if the move would leave the room, and mark the
+        tile it lands on as having been cleaned.
+        The moves are looked up in the tables of directionSteps and written
+        into the robot's Position in place, with no new objects for a step.
+        """
+        pos = self.position
+        room = self.room
+        direction = self.direction
+        x = pos.x + self.stepX[direction]
+        y = pos.y + self.stepY[direction]
+        if not (0 <= x < room.width and 0 <= y < room.height):
+            direction = self.turnAway()
+            x = pos.x + self.stepX[direction]
+            y = pos.y + self.stepY[direction]
+        # make move and clean tile after moving
+        pos.x = x
+        pos.y = y
+        room.cleanTileAtPosition(pos)
+
 #TESTING
-robot = Robot(RectangularRoom(5,8), 1.0)
+#robot = Robot(RectangularRoom(5,8), 1.0)
 #print(robot.getRobotPosition())
 #print(robot.getRobotDirection())
 
@@ -242,19 +512,7 @@ class StandardRobot(Robot):
         Move the robot to a new position and mark the tile it is on as having
         been cleaned.
         """
-        
-        # set position and direction
-        self.getRobotPosition()
-        self.getRobotDirection()
-
-        # check if new position hits wall
-        while not self.room.isPositionInRoom(self.position.getNewPosition(self.direction, self.speed)):
-            # change direction randomly	
-            self.setRobotDirection(random.randrange(0,360,1))
-        # make move
-        self.position = self.position.getNewPosition(self.direction, self.speed)
-        # clean tile after moving
-        self.room.cleanTileAtPosition(self.position)
+        self.moveAndClean()
 
     
 # Uncomment this line to see your implementation of StandardRobot in action!
@@ -263,7 +521,7 @@ class StandardRobot(Robot):
 
 # === Problem 4
 def runSimulation(num_robots, speed, width, height, min_coverage, num_trials,
-                  robot_type):
+                  robot_type, animation=None, room_type=RectangularRoom):
     """
     Runs NUM_TRIALS trials of the simulation and returns the mean number of
     time-steps needed to clean the fraction MIN_COVERAGE of the room.
@@ -277,30 +535,94 @@ def runSimulation(num_robots, speed, width, height, min_coverage, num_trials,
     num_trials: an int (num_trials > 0)
     robot_type: class of robot to be instantiated (e.g. StandardRobot or
                 RandomWalkRobot)
+    animation: a callable taking (num_robots, width, height) and returning an
+               animation of a trial with the methods update(room, robots) and
+               done() of ps2_visualize.RobotVisualization, such as that class
+               or ps2_record.FrameRecorder; called once for every trial
+    room_type: class of room to be instantiated, RectangularRoom or, for
+               rooms too large for a byte a tile, BitsetRoom or SparseRoom
     """
     
     trials_times = []
     
     for i in range(num_trials):
-        #ANIMATION#anim = ps2_visualize.RobotVisualization(num_robots, width, height)
-        room = RectangularRoom(width, height) 
-        robots = [robot_type(room, speed) for r in range(num_robots)]
-        clockTicks = 0
-        actual_coverage = 0
-        while actual_coverage < min_coverage:
-            for robot in robots:
-                #ANIMATION#anim.update(room, robots)
-                robot.updatePositionAndClean()
-            clockTicks += 1
-            actual_coverage = room.getNumCleanedTiles() / room.getNumTiles()
-        trials_times.append(clockTicks)
-        #ANIMATION#anim.done()
+        trials_times.append(runTrial(num_robots, speed, width, height,
+                                     min_coverage, robot_type, animation,
+                                     room_type))
     
     result = np.mean(trials_times)
     return result
 
+def runTrial(num_robots, speed, width, height, min_coverage, robot_type,
+             animation=None, room_type=RectangularRoom):
+    """
+    Runs a single trial of the simulation of runSimulation, with the same
+    arguments but the number of trials, and returns the number of time-steps
+    needed to clean the fraction MIN_COVERAGE of the room.
+    """
+    anim = None
+    if animation is not None:
+        anim = animation(num_robots, width, height)
+    room = room_type(width, height)
+    robots = [robot_type(room, speed) for r in range(num_robots)]
+    clockTicks = 0
+    actual_coverage = 0
+    while actual_coverage < min_coverage:
+        for robot in robots:
+            if anim is not None:
+                anim.update(room, robots)
+            robot.updatePositionAndClean()
+        clockTicks += 1
+        actual_coverage = room.getNumCleanedTiles() / room.getNumTiles()
+    if anim is not None:
+        anim.done()
+    return clockTicks
+
+def runSimulationAdaptive(num_robots, speed, width, height, min_coverage,
+                          robot_type, ci_width=None, rel_error=0.02,
+                          confidence=0.95, min_trials=10, max_trials=1000):
+    """
+    Runs trials of the simulation of runSimulation until the confidence
+    interval of the mean number of time-steps is narrow enough, instead of
+    a fixed number of trials: rooms where the time-steps hardly vary stop
+    after a few trials. The interval is the normal one, mean +- z * s / sqrt(n),
+    which is why at least MIN_TRIALS trials are run before it is trusted.
+    num_robots, speed, width, height, min_coverage and robot_type are as for
+    runSimulation.
+    ci_width: the largest width of the interval, in time-steps, or None
+    rel_error: the largest half-width of the interval as a fraction of the
+        mean, or None; trials stop as soon as either target is met
+    confidence: a float, the confidence level of the interval (0 < confidence < 1)
+    min_trials: an int, the fewest trials to run (min_trials >= 2)
+    max_trials: an int, the most trials to run, whatever the interval
+    returns: a tuple (mean, (low, high), n) of the mean number of
+    time-steps, its confidence interval and the number of trials run
+    """
+    if ci_width is None and rel_error is None:
+        raise ValueError('give ci_width or rel_error')
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    # running mean and sum of squared deviations
+    n = 0
+    mean = 0.0
+    squares = 0.0
+    while n < max_trials:
+        clockTicks = runTrial(num_robots, speed, width, height, min_coverage,
+                              robot_type)
+        n += 1
+        delta = clockTicks - mean
+        mean += delta / n
+        squares += delta * (clockTicks - mean)
+        if n >= max(min_trials, 2):
+            halfWidth = z * math.sqrt(squares / (n - 1) / n)
+            if ((ci_width is not None and 2 * halfWidth <= ci_width)
+                    or (rel_error is not None and halfWidth <= rel_error * mean)):
+                break
+    halfWidth = z * math.sqrt(squares / (n - 1) / n) if n > 1 else math.inf
+    return mean, (mean - halfWidth, mean + halfWidth), n
+
 # Uncomment this line to see how much your simulation takes on average
 #print(runSimulation(3, 1.0, 5, 5, 1, 30, StandardRobot))
+#print(runSimulationAdaptive(3, 1.0, 5, 5, 1, StandardRobot))
 
 
 # === Problem 5
@@ -315,36 +637,635 @@ class RandomWalkRobot(Robot):
         Move the robot to a new position and mark the tile it is on as having
         been cleaned.
         """
-        # set position ans direction
-        self.getRobotPosition()
-        self.getRobotDirection()
-
-        # check if new position hits wall
-        while not self.room.isPositionInRoom(self.position.getNewPosition(self.direction, self.speed)):
-            # change direction randomly	
-            self.setRobotDirection(random.randrange(0,360,1))
-        # make move
-        self.position = self.position.getNewPosition(self.direction, self.speed)
-        # clean tile after moving
-        self.room.cleanTileAtPosition(self.position)
-        # change direction randomly	
-        self.setRobotDirection(random.randrange(0,360,1))
+        self.moveAndClean()
+        # change direction randomly
+        self.direction = random.randrange(360)
 
 #testRobotMovement(RandomWalkRobot, RectangularRoom)
 #print(runSimulation(3, 1.0, 20, 20, 1, 30, RandomWalkRobot))
 
 
+def simulateTrials(num_robots, speed, width, height, min_coverage,
+                   robot_type, seed=None, room_type=RectangularRoom):
+    """
+    Runs many trials of the simulation of runSimulation at once, with the
+    same distribution of results, advancing all the robots of all the trials
+    together on NumPy arrays instead of one robot at a time. Every trial can
+    have its own number of robots and room.
+    The positions and directions of the robots of the trials still running
+    are held in flat arrays, together with the trial each robot belongs to,
+    and the cleaned tiles in an array with a row for every trial. A robot
+    that would hit a wall draws a new direction, and only the robots still
+    blocked draw again, until all of them can move. The robots of a trial
+    are dropped from the arrays as soon as it reaches MIN_COVERAGE.
+    With another ROOM_TYPE than RectangularRoom every trial has a room of
+    that type instead of its row, cleaned with room.cleanTiles, for a few
+    trials in rooms too large for a byte a tile.
+    num_robots: an int or an array of ints, the number of robots of every
+        trial (num_robots > 0)
+    speed: a float (speed > 0)
+    width: an int or an array of ints, the room width of every trial
+    height: an int or an array of ints, the room height of every trial
+    min_coverage: a float (0 <= min_coverage <= 1.0)
+    robot_type: StandardRobot or RandomWalkRobot
+    seed: seed of the random numbers, for repeatable runs
+    room_type: RectangularRoom, BitsetRoom or SparseRoom
+    The number of trials is the length of the arrays among num_robots,
+    width and height.
+    returns: an array with the number of time-steps every trial needed to
+    clean the fraction MIN_COVERAGE of its room
+    """
+    if robot_type not in (StandardRobot, RandomWalkRobot):
+        raise ValueError('unsupported robot type ' + repr(robot_type))
+    rng = np.random.default_rng(seed)
+    num_robots, width, height = map(np.atleast_1d, np.broadcast_arrays(
+        num_robots, width, height))
+    numTrials = num_robots.size
+    numTiles = width * height
+    rowSize = int(numTiles.max())
+    # the move of one time-step in every integer direction
+    stepX, stepY = map(np.array, directionSteps(speed))
+
+    # the trial of every robot and its room, robots start on random tiles
+    # facing random directions
+    trial = np.repeat(np.arange(numTrials), num_robots)
+    w = width[trial].astype(float)
+    h = height[trial]
+    x = np.floor(rng.random(len(trial)) * w)
+    y = np.floor(rng.random(len(trial)) * h)
+    # random directions are drawn in bulk and handed out by draw
+    pool = []
+    def draw(n):
+        if len(pool) == 0 or len(pool[0]) < n:
+            pool[:] = [rng.integers(0, 360, max(n, 1 << 16))]
+        turn, pool[0] = pool[0][:n], pool[0][n:]
+        return turn
+
+    direction = draw(len(trial))
+    if room_type is RectangularRoom:
+        rooms = None
+        cleaned = np.zeros(numTrials * rowSize, dtype=bool)
+        cleaned[trial * rowSize + x.astype(int) * h + y.astype(int)] = True
+        numCleaned = cleaned.reshape(numTrials, rowSize).sum(axis=1)
+        # scratch space to find the tiles cleaned twice in the same time-step
+        owner = np.zeros(numTrials * rowSize, dtype=np.int64)
+    else:
+        rooms = [room_type(int(width.flat[t]), int(height.flat[t]))
+                 for t in range(numTrials)]
+        numCleaned = np.zeros(numTrials, dtype=int)
+    def cleanRooms():
+        # trial is sorted, so the robots of every trial are a slice
+        tiles = x.astype(int) * h + y.astype(int)
+        starts = np.flatnonzero(np.diff(trial, prepend=-1))
+        fresh = 0
+        for start, end in zip(starts, np.append(starts[1:], len(trial))):
+            room = rooms[trial[start]]
+            fresh += room.cleanTiles(tiles[start:end])
+            numCleaned[trial[start]] = room.getNumCleanedTiles()
+        return fresh
+
+    if rooms is not None:
+        cleanRooms()
+    ticks = np.zeros(numTrials, dtype=int)
+    if min_coverage <= 0:
+        # runSimulation finds such a room covered before any time-step
+        return ticks
+
+    running = np.ones(numTrials, dtype=bool)
+    tick = 0
+    while len(trial) > 0:
+        tick += 1
+        newX = x + stepX[direction]
+        newY = y + stepY[direction]
+        blocked = ((newX < 0) | (newX >= w)
+                   | (newY < 0) | (newY >= h)).nonzero()[0]
+        while len(blocked) > 0:
+            turn = draw(len(blocked))
+            direction[blocked] = turn
+            bx = x[blocked] + stepX[turn]
+            by = y[blocked] + stepY[turn]
+            newX[blocked] = bx
+            newY[blocked] = by
+            blocked = blocked[(bx < 0) | (bx >= w[blocked])
+                              | (by < 0) | (by >= h[blocked])]
+        x, y = newX, newY
+        if robot_type is RandomWalkRobot:
+            direction = draw(len(direction))
+
+        # clean the tiles under the robots, counting every tile once
+        if rooms is None:
+            tiles = trial * rowSize + x.astype(int) * h + y.astype(int)
+            tiles = tiles[~cleaned[tiles]]
+            fresh = len(tiles)
+            if fresh > 0:
+                order = np.arange(len(tiles))
+                owner[tiles] = order
+                tiles = tiles[owner[tiles] == order]
+                cleaned[tiles] = True
+                numCleaned += np.bincount(tiles // rowSize, minlength=numTrials)
+        else:
+            fresh = cleanRooms()
+        # the coverage only changes with new tiles, but runSimulation looks
+        # at it after the first time-step whatever the tiles the robots
+        # started on
+        if fresh > 0 or tick == 1:
+            done = running & (numCleaned / numTiles >= min_coverage)
+            if done.any():
+                ticks[done] = tick
+                running &= ~done
+                keep = running[trial]
+                trial, x, y, direction, w, h = (trial[keep], x[keep],
+                                                y[keep], direction[keep],
+                                                w[keep], h[keep])
+    return ticks
+
+
+def runSimulationVectorized(num_robots, speed, width, height, min_coverage,
+                            num_trials, robot_type, seed=None,
+                            room_type=RectangularRoom):
+    """
+    Runs the same simulation as runSimulation, with the same arguments and
+    the same distribution of results, with all the trials advanced together
+    by simulateTrials.
+    seed: seed of the random numbers, for repeatable runs
+    room_type: the type of the rooms, as for simulateTrials
+    returns: the mean number of time-steps needed to clean the fraction
+    MIN_COVERAGE of the room
+    """
+    return np.mean(simulateTrials(np.full(num_trials, num_robots), speed,
+                                  width, height, min_coverage, robot_type,
+                                  seed, room_type))
+
+
+def tilesNeeded(num_tiles, min_coverage):
+    """
+    Return the smallest number of clean tiles with which runSimulation finds a
+    room of NUM_TILES tiles covered to the fraction MIN_COVERAGE.
+    num_tiles: an int (num_tiles > 0)
+    min_coverage: a float (0 <= min_coverage <= 1.0)
+    """
+    if not 0 <= min_coverage <= 1:
+        raise ValueError('min_coverage must be between 0 and 1')
+    needed = max(0, math.ceil(min_coverage * num_tiles) - 1)
+    while needed / num_tiles < min_coverage:
+        needed += 1
+    return needed
+
+
+def stepsInside(x, dx, size):
+    """
+    Return the largest number of moves of DX from X, which is in [0, SIZE),
+    that stay in [0, SIZE) after each move, or None if there is no limit.
+    """
+    if dx > 0:
+        steps = int((size - x) / dx)
+        while x + (steps + 1) * dx < size:
+            steps += 1
+        while steps > 0 and x + steps * dx >= size:
+            steps -= 1
+    elif dx < 0:
+        steps = int(x / -dx)
+        while x + (steps + 1) * dx >= 0:
+            steps += 1
+        while steps > 0 and x + steps * dx < 0:
+            steps -= 1
+    else:
+        return None
+    return steps
+
+
+def stepVisits(segments, height):
+    """
+    Return the tiles the robots are on at every time-step along straight
+    segments, and the time-steps.
+    segments: arrays of the start x and y, the moves dx and dy, the
+        time-step at the start and the number of time-steps of every segment,
+        the robot being at (x + k*dx, y + k*dy) after k time-steps of it
+    height: the height of the room, tiles being numbered as in the room
+    returns: a pair of arrays of ints
+    """
+    startX, startY, moveX, moveY, startTick, lengths = segments
+    # every time-step of every segment, k counting from 1 in each
+    segment = np.repeat(np.arange(len(lengths)), lengths)
+    k = np.arange(1, len(segment) + 1) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    xs = startX[segment] + k * moveX[segment]
+    ys = startY[segment] + k * moveY[segment]
+    return (xs.astype(np.int64) * height + ys.astype(np.int64),
+            startTick[segment] + k)
+
+
+def boundaryCrossings(start, move, lengths):
+    """
+    Return where the points start + k*move, for k from 1 to the lengths, cross
+    the integer boundaries between tiles, as the segment of every crossing
+    and the first k past it, the positions being rounded as stepVisits
+    rounds them.
+    """
+    end = start + lengths * move
+    counts = np.abs(np.floor(end) - np.floor(start)).astype(np.int64)
+    segment = np.repeat(np.arange(len(lengths)), counts)
+    j = np.arange(len(segment)) - np.repeat(np.cumsum(counts) - counts, counts)
+    # moving up the next boundary is floor(start) + 1, moving down floor(start)
+    first = np.floor(start) + (move > 0)
+    boundary = first[segment] + np.where(move[segment] > 0, j, -j)
+    start, move, lengths = start[segment], move[segment], lengths[segment]
+
+    def crossed(k, which=slice(None)):
+        # a move down leaves the tile only once it is below the boundary
+        positions = start[which] + k * move[which]
+        return np.where(move[which] > 0, positions >= boundary[which],
+                        positions < boundary[which])
+
+    # the crossing is at s = (boundary - start) / move, but a position that
+    # lands on the boundary, or rounds onto either side of it, can put the
+    # first k past it a time-step or more away from ceil(s); the positions
+    # only ever move one way, so those crossings are found by bisection
+    k = np.clip(np.ceil((boundary - start) / move), 1, lengths).astype(np.int64)
+    wrong = np.flatnonzero(~crossed(k) | ((k > 1) & crossed(k - 1)))
+    if len(wrong) > 0:
+        late = crossed(k[wrong], wrong)
+        low = np.where(late, 0, k[wrong])
+        high = np.where(late, k[wrong], lengths[wrong])
+        while np.any(high - low > 1):
+            middle = (low + high) // 2
+            past = crossed(middle, wrong)
+            high = np.where(past, middle, high)
+            low = np.where(past, low, middle)
+        k[wrong] = high
+    return segment, k
+
+
+def crossingVisits(segments, height):
+    """
+    Return the first time-step at which the robots are on every tile they
+    visit along straight segments, for moves shorter than a tile: only the
+    first time-step after the start of a segment and after every crossing
+    from tile to tile is looked at, so the cost follows the number of tiles
+    crossed rather than the number of time-steps. Every one of them is a
+    time-step on the tile it finds, and every tile is found at its first.
+    segments and height are as for stepVisits.
+    returns: a pair of arrays of ints
+    """
+    startX, startY, moveX, moveY, startTick, lengths = segments
+    crossX = boundaryCrossings(startX, moveX, lengths)
+    crossY = boundaryCrossings(startY, moveY, lengths)
+    moving = np.flatnonzero(lengths > 0)
+    segment = np.concatenate((moving, crossX[0], crossY[0]))
+    k = np.concatenate((np.ones(len(moving), dtype=np.int64), crossX[1], crossY[1]))
+    xs = startX[segment] + k * moveX[segment]
+    ys = startY[segment] + k * moveY[segment]
+    return (xs.astype(np.int64) * height + ys.astype(np.int64),
+            startTick[segment] + k)
+
+
+def firstVisits(tiles, ticks):
+    """
+    Return the tiles among TILES and the first of TICKS at which each of them
+    is visited, sorted by tile.
+    """
+    order = np.lexsort((ticks, tiles))
+    tiles, ticks = tiles[order], ticks[order]
+    first = np.diff(tiles, prepend=-1) != 0
+    return tiles[first], ticks[first]
+
+
+def checkCrossingVisits(num_segments, speed, width=50, height=50, seed=0):
+    """
+    Return the number of segments, out of NUM_SEGMENTS random ones in a room
+    of WIDTH by HEIGHT at SPEED, along which crossingVisits finds other tiles
+    or other first time-steps than stepVisits. Half the segments start on
+    the corner of a tile and half run along an axis, so that positions land
+    on the boundaries between tiles.
+    """
+    rng = np.random.default_rng(seed)
+    stepX, stepY = directionSteps(speed)
+    wrong = 0
+    for i in range(num_segments):
+        direction = rng.integers(360)
+        if i % 2 == 0:
+            direction = direction // 90 * 90
+        x, y = rng.integers(width), rng.integers(height)
+        if i % 4 >= 2:
+            x, y = x + rng.random(), y + rng.random()
+        dx, dy = stepX[direction], stepY[direction]
+        length = min(steps for steps in (stepsInside(x, dx, width),
+                                         stepsInside(y, dy, height))
+                     if steps is not None)
+        segments = tuple(map(np.array, ([x], [y], [dx], [dy], [0], [length])))
+        expected = firstVisits(*stepVisits(segments, height))
+        found = firstVisits(*crossingVisits(segments, height))
+        if not (np.array_equal(expected[0], found[0])
+                and np.array_equal(expected[1], found[1])):
+            wrong += 1
+    return wrong
+
+#print(checkCrossingVisits(20000, 0.25))
+
+
+def standardVisits(robots, robotTicks, horizon):
+    """
+    Moves StandardRobots from wall to wall up to the time-step HORIZON.
+    robots: a list of StandardRobots of the same room and speed
+    robotTicks: a list of the time-step every robot is at, moved on to
+        HORIZON
+    returns: the tiles the robots were on after the time-steps they moved,
+    and those time-steps, as for stepVisits
+    """
+    room = robots[0].room
+    width, height = room.width, room.height
+    stepX, stepY = robots[0].stepX, robots[0].stepY
+    # the segments every robot moves along up to the horizon
+    startX = []
+    startY = []
+    moveX = []
+    moveY = []
+    startTick = []
+    lengths = []
+    for r, robot in enumerate(robots):
+        pos = robot.position
+        tick = robotTicks[r]
+        while tick < horizon:
+            direction = robot.direction
+            if not (0 <= pos.x + stepX[direction] < width
+                    and 0 <= pos.y + stepY[direction] < height):
+                direction = robot.turnAway()
+            dx, dy = stepX[direction], stepY[direction]
+            steps = horizon - tick
+            wall = stepsInside(pos.x, dx, width)
+            if wall is not None and wall < steps:
+                steps = wall
+            wall = stepsInside(pos.y, dy, height)
+            if wall is not None and wall < steps:
+                steps = wall
+            startX.append(pos.x)
+            startY.append(pos.y)
+            moveX.append(dx)
+            moveY.append(dy)
+            startTick.append(tick)
+            lengths.append(steps)
+            pos.x += steps * dx
+            pos.y += steps * dy
+            tick += steps
+        robotTicks[r] = tick
+
+    segments = tuple(map(np.array, (startX, startY, moveX, moveY,
+                                    startTick, lengths)))
+    if robots[0].speed < 1:
+        return crossingVisits(segments, height)
+    return stepVisits(segments, height)
+
+
+def standardFirstVisits(num_robots, speed, width, height, needed):
+    """
+    Runs StandardRobots from wall to wall, as described for
+    simulateStandardTrial, until at least NEEDED tiles have been reached, and
+    returns the first time-step at which a robot was on every tile.
+    needed: an int, the number of tiles to reach (0 < needed <= width * height)
+    returns: an array of ints, one for every tile numbered as in
+    RectangularRoom, the largest int64 for tiles not reached
+    """
+    room = RectangularRoom(width, height)
+    robots = [StandardRobot(room, speed) for r in range(num_robots)]
+    # the first time-step each tile is reached, tiles being numbered as in the room
+    never = np.iinfo(np.int64).max
+    firstVisit = np.full(room.getNumTiles(), never, dtype=np.int64)
+    for robot in robots:
+        pos = robot.getRobotPosition()
+        firstVisit[int(pos.x) * height + int(pos.y)] = 0
+    robotTicks = [0] * num_robots
+
+    # no robot cleans more than a tile a time-step
+    horizon = -(-needed // num_robots)
+    while True:
+        tiles, ticks = standardVisits(robots, robotTicks, horizon)
+
+        # keep the earliest time-step of every tile
+        np.minimum.at(firstVisit, tiles, ticks)
+        if np.count_nonzero(firstVisit <= horizon) >= needed:
+            break
+        horizon += max(horizon // 2, 16)
+    return firstVisit
+
+
+def standardNewVisits(num_robots, speed, width, height, room_type,
+                      window=1 << 20):
+    """
+    Runs StandardRobots from wall to wall as standardFirstVisits does, but in
+    a room of ROOM_TYPE that keeps the tiles reached, a few time-steps at a
+    time, so that a huge room takes the memory of the room and of the visits
+    of those few time-steps only.
+    window: about the number of tiles visited by all the robots together
+        in each of those runs of time-steps
+    yields: for the start and every run of time-steps after it, an array of
+    the time-steps at which tiles were first reached in it, in order
+    """
+    room = room_type(width, height)
+    robots = [StandardRobot(room, speed) for r in range(num_robots)]
+    yield np.zeros(room.getNumCleanedTiles(), dtype=np.int64)
+    robotTicks = [0] * num_robots
+    step = max(window // num_robots, 16)
+    horizon = 0
+    while room.getNumCleanedTiles() < room.getNumTiles():
+        horizon += step
+        tiles, ticks = standardVisits(robots, robotTicks, horizon)
+        # the first visit of every tile in these time-steps, if it was dirty
+        order = np.lexsort((ticks, tiles))
+        tiles, ticks = tiles[order], ticks[order]
+        first = np.diff(tiles, prepend=-1) != 0
+        tiles, ticks = tiles[first], ticks[first]
+        dirty = ~room.areTilesCleaned(tiles)
+        room.cleanTiles(tiles[dirty])
+        yield np.sort(ticks[dirty])
+
+
+def simulateStandardTrial(num_robots, speed, width, height, min_coverage,
+                          shortSegment=24, room_type=RectangularRoom):
+    """
+    Runs one trial of the simulation of runSimulation with StandardRobots,
+    with the same distribution of results, jumping over the straight lines
+    the robots move along between hitting walls instead of stepping them one
+    time-step at a time.
+    Where a StandardRobot goes never depends on which tiles are clean, so
+    every robot is followed on its own from wall to wall: the number of
+    time-steps until it hits the next wall is worked out from its distance
+    to the walls, and a robot that moves K time-steps along (dx, dy) from
+    (x, y) is at (x + k*dx, y + k*dy) after k of them. The tiles along all
+    the segments are then found together, by stepVisits or, for robots
+    slower than a tile a time-step, by crossingVisits, and the first
+    time-step at which any robot is on a tile kept for every tile. The
+    robots are run up to a horizon that grows until enough tiles are
+    reached, and the trial ends at the time-step of the tile that brings the
+    clean tiles up to MIN_COVERAGE.
+    Positions differ from those of step by step in the last bits only, since
+    k*dx is rounded once where k additions of dx are rounded k times.
+    The first time-steps are kept in an array of every tile, unless
+    ROOM_TYPE is another than RectangularRoom: the reached tiles are then
+    kept in a room of that type by standardNewVisits.
+    num_robots: an int (num_robots > 0)
+    speed: a float (speed > 0)
+    width: an int (width > 0)
+    height: an int (height > 0)
+    min_coverage: a float (0 <= min_coverage <= 1.0)
+    shortSegment: the mean number of time-steps between walls below which
+        the robots are stepped one time-step at a time instead
+    room_type: RectangularRoom, BitsetRoom or SparseRoom
+    returns: the number of time-steps needed to clean the fraction
+    MIN_COVERAGE of the room
+    """
+    # the mean length of a straight line across the room, in time-steps
+    if math.pi * width * height / (2 * (width + height)) / speed < shortSegment:
+        # the robots hit walls too often to be worth jumping between them
+        return runTrial(num_robots, speed, width, height, min_coverage,
+                        StandardRobot, room_type=room_type)
+    needed = tilesNeeded(width * height, min_coverage)
+    if needed == 0:
+        return 0
+    if room_type is RectangularRoom:
+        firstVisit = standardFirstVisits(num_robots, speed, width, height, needed)
+        clockTicks = int(np.partition(firstVisit, needed - 1)[needed - 1])
+    else:
+        for ticks in standardNewVisits(num_robots, speed, width, height,
+                                       room_type):
+            if len(ticks) >= needed:
+                clockTicks = int(ticks[needed - 1])
+                break
+            needed -= len(ticks)
+    # runSimulation always runs at least one time-step
+    return max(clockTicks, 1)
+
+
+def runSimulationEventDriven(num_robots, speed, width, height, min_coverage,
+                             num_trials, room_type=RectangularRoom):
+    """
+    Runs the same simulation as runSimulation with StandardRobots, with the
+    same arguments and the same distribution of results, running every trial
+    with simulateStandardTrial.
+    room_type: the type of the room, as for simulateStandardTrial
+    returns: the mean number of time-steps needed to clean the fraction
+    MIN_COVERAGE of the room
+    """
+    return np.mean([simulateStandardTrial(num_robots, speed, width, height,
+                                          min_coverage, room_type=room_type)
+                    for i in range(num_trials)])
+
+#print(runSimulationEventDriven(3, 0.5, 300, 300, 0.8, 10))
+
+
+def runCoverageTrial(num_robots, speed, width, height, robot_type,
+                     max_coverage=1.0, shortSegment=24,
+                     room_type=RectangularRoom):
+    """
+    Runs a single trial of the simulation of runSimulation up to the fraction
+    MAX_COVERAGE of the room and records the time-step at which every number
+    of clean tiles is first reached, so that one run gives the time-steps of
+    every lower coverage too. StandardRobots are run by standardFirstVisits
+    when the walls are far enough apart for it to pay, the others step by
+    step.
+    num_robots, speed, width, height and robot_type are as for runSimulation.
+    max_coverage: a float, the coverage at which the trial stops
+        (0 <= max_coverage <= 1.0)
+    shortSegment: as for simulateStandardTrial
+    room_type: as for simulateStandardTrial
+    returns: an array of uint32 with an entry for every number of clean tiles
+    c from 0 to tilesNeeded(width * height, max_coverage): the time-step at
+    which c tiles are first clean
+    """
+    needed = tilesNeeded(width * height, max_coverage)
+    curve = np.zeros(needed + 1, dtype=np.uint32)
+    if needed == 0:
+        return curve
+    if (robot_type is StandardRobot
+            and math.pi * width * height / (2 * (width + height)) / speed >= shortSegment):
+        if room_type is RectangularRoom:
+            firstVisit = standardFirstVisits(num_robots, speed, width, height, needed)
+            curve[1:] = np.partition(firstVisit, needed - 1)[:needed]
+            curve[1:].sort()
+            return curve
+        clean = 0
+        for ticks in standardNewVisits(num_robots, speed, width, height,
+                                       room_type):
+            ticks = ticks[:needed - clean]
+            curve[clean + 1:clean + 1 + len(ticks)] = ticks
+            clean += len(ticks)
+            if clean == needed:
+                return curve
+    room = room_type(width, height)
+    robots = [robot_type(room, speed) for r in range(num_robots)]
+    clean = room.getNumCleanedTiles()
+    clockTicks = 0
+    while clean < needed:
+        for robot in robots:
+            robot.updatePositionAndClean()
+        clockTicks += 1
+        cleanNow = room.getNumCleanedTiles()
+        if cleanNow > clean:
+            curve[clean + 1:cleanNow + 1] = clockTicks
+            clean = cleanNow
+    return curve
+
+
+def runCoverageCurves(num_robots, speed, width, height, num_trials,
+                      robot_type, max_coverage=1.0, room_type=RectangularRoom):
+    """
+    Runs NUM_TRIALS trials with runCoverageTrial and returns their curves as
+    the rows of an array of uint32, of shape
+    (num_trials, tilesNeeded(width * height, max_coverage) + 1).
+    room_type: as for runCoverageTrial
+    """
+    curves = np.zeros((num_trials, tilesNeeded(width * height, max_coverage) + 1),
+                      dtype=np.uint32)
+    for i in range(num_trials):
+        curves[i] = runCoverageTrial(num_robots, speed, width, height,
+                                     robot_type, max_coverage,
+                                     room_type=room_type)
+    return curves
+
+
+def coverageDistribution(curves, num_tiles, levels=None,
+                         percentiles=(5, 50, 95)):
+    """
+    Return the distribution over the trials of the number of time-steps
+    runSimulation would find for every coverage in LEVELS, from the curves of
+    runCoverageCurves.
+    curves: an array of coverage curves, one row for every trial
+    num_tiles: an int, the number of tiles of the room
+    levels: a list of floats, the coverages, by default that of every number
+        of tiles the curves reach
+    percentiles: the percentiles to return, numbers from 0 to 100
+    returns: a tuple (levels, means, values) of arrays, means with the mean
+    number of time-steps for every level and values with a row for every
+    percentile and a column for every level
+    """
+    if levels is None:
+        levels = np.arange(curves.shape[1]) / num_tiles
+        counts = np.arange(curves.shape[1])
+    else:
+        levels = np.asarray(levels, dtype=float)
+        counts = np.array([tilesNeeded(num_tiles, level) for level in levels],
+                          dtype=int)
+        if len(counts) > 0 and counts.max() >= curves.shape[1]:
+            raise ValueError('the curves do not reach coverage %g' % levels.max())
+    times = curves[:, counts].astype(np.int64)
+    # runSimulation always runs at least one time-step for a coverage above 0
+    times[:, levels > 0] = np.maximum(times[:, levels > 0], 1)
+    return (levels, times.mean(axis=0),
+            np.percentile(times, percentiles, axis=0))
+
+#curves = runCoverageCurves(3, 1.0, 20, 20, 100, StandardRobot)
+#print(coverageDistribution(curves, 400, [0.5, 0.8, 0.9, 1.0]))
+
+
 def showPlot1(title, x_label, y_label):
     """
     What information does the plot produced by this function tell you?
     """
+    import pylab
     num_robot_range = range(1, 11)
-    times1 = []
-    times2 = []
-    for num_robots in num_robot_range:
-        print("Plotting", num_robots, "robots...")
-        times1.append(runSimulation(num_robots, 1.0, 20, 20, 0.8, 20, StandardRobot))
-        times2.append(runSimulation(num_robots, 1.0, 20, 20, 0.8, 20, RandomWalkRobot))
+    # the 20 trials of every number of robots, all simulated together
+    num_robots = np.repeat(num_robot_range, 20)
+    print("Plotting 1 to 10 robots...")
+    times1 = simulateTrials(num_robots, 1.0, 20, 20, 0.8, StandardRobot).reshape(-1, 20).mean(axis=1)
+    times2 = simulateTrials(num_robots, 1.0, 20, 20, 0.8, RandomWalkRobot).reshape(-1, 20).mean(axis=1)
     pylab.plot(num_robot_range, times1)
     pylab.plot(num_robot_range, times2)
     pylab.title(title)
@@ -357,15 +1278,17 @@ def showPlot2(title, x_label, y_label):
     """
     What information does the plot produced by this function tell you?
     """
+    import pylab
     aspect_ratios = []
-    times1 = []
-    times2 = []
     for width in [10, 20, 25, 50]:
         height = 300//width
         print("Plotting cleaning time for a room of width:", width, "by height:", height)
         aspect_ratios.append(float(width) / height)
-        times1.append(runSimulation(2, 1.0, width, height, 0.8, 200, StandardRobot))
-        times2.append(runSimulation(2, 1.0, width, height, 0.8, 200, RandomWalkRobot))
+    # the 200 trials of every room, all simulated together
+    widths = np.repeat([10, 20, 25, 50], 200)
+    heights = 300//widths
+    times1 = simulateTrials(2, 1.0, widths, heights, 0.8, StandardRobot).reshape(-1, 200).mean(axis=1)
+    times2 = simulateTrials(2, 1.0, widths, heights, 0.8, RandomWalkRobot).reshape(-1, 200).mean(axis=1)
     pylab.plot(aspect_ratios, times1)
     pylab.plot(aspect_ratios, times2)
     pylab.title(title)
@@ -0,0 +1,204 @@
+# Problem Set 2:
+# Live view of simulated robots that never holds the simulation up.
+# A LiveView stands in for ps2_visualize.RobotVisualization in runSimulation:
+#
+#     runSimulation(3, 1.0, 20, 20, 0.8, 1, StandardRobot, animation=LiveView)
+#
+# The simulation sends snapshots of what changed to a window drawn by another
+# process, and skips frames whenever the window is behind.
+
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+from ps2_record import RobotSnapshot, TileTracker
+
+
+class _RoomState:
+    "The clean tiles of the room as the viewer knows them."
+    def __init__(self, width, height):
+        self.height = height
+        self.tiles = bytearray(width * height)
+        self.num_cleaned = 0
+
+    def isTileCleaned(self, m, n):
+        return self.tiles[m * self.height + n] == 1
+
+    def getNumCleanedTiles(self):
+        return self.num_cleaned
+
+
+def merge(first, second):
+    """
+    Returns the snapshot of the changes of two snapshots in a row: the tiles
+    cleaned in either and the robots and counts of the second.
+    """
+    return (second[0], np.concatenate((first[1], second[1])), second[2],
+            second[3])
+
+
+def view(snapshots, num_robots, width, height, delay, viewer=None):
+    """
+    Draws the snapshots of a LiveView as they arrive, until the None that
+    ends them. When several are waiting they are merged and drawn as one, so
+    the window catches up with the simulation instead of lagging further.
+    Runs in the process of the window.
+    snapshots - the queue of snapshots
+    viewer - the class drawing the window, RobotVisualization by default
+    """
+    if viewer is None:
+        from ps2_visualize import RobotVisualization as viewer
+    anim = viewer(num_robots, width, height, delay)
+    room = _RoomState(width, height)
+    finished = False
+    while not finished:
+        snapshot = snapshots.get()
+        if snapshot is None:
+            break
+        while True:
+            try:
+                more = snapshots.get_nowait()
+            except queue.Empty:
+                break
+            if more is None:
+                finished = True
+                break
+            snapshot = merge(snapshot, more)
+        tick, tiles, poses, num_cleaned = snapshot
+        for tile in tiles:
+            room.tiles[tile] = 1
+        room.num_cleaned = num_cleaned
+        # RobotVisualization counts its own frames, and some were skipped
+        anim.time = tick - 1
+        anim.update(room, [RobotSnapshot(*pose) for pose in poses.tolist()])
+    anim.done()
+
+
+# the window processes started, joined once their windows are closed
+_windows = []
+
+
+def _join_closed():
+    "Joins the window processes whose windows have been closed."
+    for process in [p for p in _windows if not p.is_alive()]:
+        process.join()
+        _windows.remove(process)
+
+
+class LiveView:
+    """
+    Shows a trial of the simulation live, with the interface of
+    ps2_visualize.RobotVisualization, in a window drawn by a separate
+    process. Every update puts a snapshot on a bounded queue: the tiles
+    cleaned since the last snapshot and the positions and directions of the
+    robots. When the queue is full the frame is dropped, its tiles being
+    sent with the next one, so the simulation never waits for the window.
+    Once the window is gone, closed or never opened, nothing more is sent.
+    """
+    def __init__(self, num_robots, width, height, delay=0.05, size=4,
+                 stride=1, viewer=None, timeout=5.0):
+        """
+        num_robots, width, height - as for RobotVisualization
+        delay - the number of seconds the window pauses after every frame
+        size - the largest number of snapshots waiting to be drawn
+        stride - the number of calls of update per snapshot (an int)
+        viewer - the class drawing the window, which must be importable by
+            the window's process, RobotVisualization by default
+        timeout - the number of seconds done waits for the window to take
+            the last snapshots before closing it
+        """
+        self.stride = stride
+        self.timeout = timeout
+        self.tracker = TileTracker(width, height)
+        self.pending = []
+        self.poses = np.zeros((0, 3))
+        self.time = 0
+        self.sent = 0
+        self.dropped = 0
+        self.snapshots = multiprocessing.Queue(size)
+        self.process = multiprocessing.Process(
+            target=view, args=(self.snapshots, num_robots, width, height,
+                               delay, viewer))
+        self.process.start()
+        _join_closed()
+        _windows.append(self.process)
+
+    def update(self, room, robots):
+        "Sends a snapshot of the room and robots, unless the window is behind."
+        self.time += 1
+        if self.process is None:
+            return
+        self.room = room
+        self.robots = robots
+        if (self.time - 1) % self.stride != 0:
+            self.tracker.look(room, robots)
+            return
+        self.pending.append(self.tracker.changes(room, robots).astype(np.int32))
+        self.poses = self._poses(robots)
+        tiles = (self.pending[0] if len(self.pending) == 1
+                 else np.concatenate(self.pending))
+        try:
+            self.snapshots.put_nowait((self.time, tiles, self.poses,
+                                       room.getNumCleanedTiles()))
+        except queue.Full:
+            self.pending = [tiles]
+            self.dropped += 1
+            if not self.process.is_alive():
+                self._close()
+            return
+        self.pending = []
+        self.sent += 1
+
+    def _poses(self, robots):
+        "Returns an array of the position and direction of every robot."
+        return np.array([(robot.getRobotPosition().getX(),
+                          robot.getRobotPosition().getY(),
+                          robot.getRobotDirection()) for robot in robots])
+
+    def _close(self):
+        "Stops sending snapshots to a window that is gone, and joins it."
+        self.process.join()
+        if self.process in _windows:
+            _windows.remove(self.process)
+        # snapshots still buffered would keep this process from exiting
+        self.snapshots.cancel_join_thread()
+        self.process = None
+        self.pending = []
+
+    def _put(self, snapshot, deadline):
+        """
+        Puts a snapshot on the queue, waiting for room while the window is
+        open and until the deadline. Returns False, having closed the window,
+        if it could not.
+        """
+        while self.process.is_alive():
+            try:
+                self.snapshots.put(snapshot, timeout=0.1)
+                return True
+            except queue.Full:
+                if time.monotonic() > deadline:
+                    self.process.terminate()
+        self._close()
+        return False
+
+    def done(self):
+        """
+        Sends the changes since the last snapshot sent, with the robots as
+        the trial left them, and the end of the snapshots, the only puts that
+        wait for room on the queue, for TIMEOUT seconds at most. The window stays open until it is closed, without holding up
+        the simulation.
+        """
+        if self.process is None:
+            return
+        deadline = time.monotonic() + self.timeout
+        if self.time > 0:
+            # the last move of the trial comes after the last update
+            self.pending.append(self.tracker.changes(self.room, self.robots)
+                                .astype(np.int32))
+            if not self._put((self.time + 1, np.concatenate(self.pending),
+                              self._poses(self.robots),
+                              self.room.getNumCleanedTiles()), deadline):
+                return
+        self._put(None, deadline)
@@ -0,0 +1,229 @@
+# Problem Set 2:
+# Trajectory logs of simulated robots, to look at a run after it is over.
+# A TrajectoryLog stands in for ps2_visualize.RobotVisualization in
+# runSimulation and writes, for every time-step, the position and direction
+# of every robot and the tiles cleaned, to fixed-width binary files:
+#
+#     runSimulation(3, 1.0, 20, 20, 0.8, 1, StandardRobot,
+#                   animation=logger('run'))
+#     replay = TrajectoryReplay('run')
+#     replay.poses[100]['x']        # the x of every robot after 100 time-steps
+#     replay.play(100, 200)         # shown with RobotVisualization
+#
+# The files are read through numpy.memmap, so a replay only loads the
+# time-steps it looks at, however long the run.
+
+import json
+
+import numpy as np
+
+from ps2_record import RobotSnapshot, TileTracker, numbered_trials
+
+# a robot at the end of a time-step, and a tile cleaned at a time-step
+POSE = np.dtype([('x', '<f8'), ('y', '<f8'), ('direction', '<u2')])
+EVENT = np.dtype([('tick', '<u4'), ('tile', '<u8')])
+FORMAT = 1
+
+
+def _files(path):
+    "Returns the names of the sidecar, pose and event files of a log."
+    return path + '.json', path + '.poses', path + '.tiles'
+
+
+class _GrowingFile:
+    """
+    A fixed-width binary file of records written through a memmap, which is
+    made longer as records are appended and cut to them when closed.
+    """
+    def __init__(self, path, dtype, capacity=1024):
+        self.path = path
+        self.dtype = dtype
+        self.length = 0
+        self.capacity = 0
+        self.array = None
+        open(path, 'wb').close()
+        self._resize(capacity)
+
+    def _resize(self, capacity):
+        if self.array is not None:
+            self.array.flush()
+            self.array = None
+        with open(self.path, 'r+b') as f:
+            f.truncate(capacity * self.dtype.itemsize)
+        if capacity > 0:
+            self.array = np.memmap(self.path, self.dtype, 'r+', shape=(capacity,))
+        self.capacity = capacity
+
+    def append(self, records):
+        "Appends an array of records."
+        end = self.length + len(records)
+        if end > self.capacity:
+            self._resize(max(2 * self.capacity, end))
+        self.array[self.length:end] = records
+        self.length = end
+
+    def close(self):
+        self._resize(self.length)
+        self.array = None
+
+
+class TrajectoryLog:
+    """
+    Logs a trial of the simulation, with the interface of
+    ps2_visualize.RobotVisualization: runSimulation calls update(room, robots)
+    before every move of a robot, so the first call of every time-step sees
+    the robots as the previous one left them, and done() after the last.
+    The log of PATH is three files: PATH.poses, with NUM_ROBOTS records of
+    POSE for every time-step from 0, PATH.tiles, with a record of EVENT for
+    every tile cleaned, in the order of the time-steps, and PATH.json,
+    describing both.
+    """
+    def __init__(self, num_robots, width, height, path='trajectory'):
+        """
+        num_robots, width, height - as for RobotVisualization
+        path - the name of the log, without the extensions of its files
+        """
+        self.num_robots = num_robots
+        self.width = width
+        self.height = height
+        self.path = path
+        self.tracker = TileTracker(width, height)
+        self.calls = 0
+        self.ticks = 0
+        self.poses = np.zeros(num_robots, dtype=POSE)
+        sidecar, poses, tiles = _files(path)
+        self.pose_file = _GrowingFile(poses, POSE)
+        self.event_file = _GrowingFile(tiles, EVENT)
+
+    def _log(self, room, robots):
+        "Appends the robots and the tiles cleaned as they are after a time-step."
+        for i, robot in enumerate(robots):
+            position = robot.getRobotPosition()
+            self.poses[i] = (position.getX(), position.getY(),
+                             robot.getRobotDirection())
+        self.pose_file.append(self.poses)
+        changed = self.tracker.changes(room, robots)
+        if len(changed) > 0:
+            events = np.zeros(len(changed), dtype=EVENT)
+            events['tick'] = self.ticks
+            events['tile'] = changed
+            self.event_file.append(events)
+        self.ticks += 1
+
+    def update(self, room, robots):
+        "Logs the time-step just over, at the first move of the next."
+        if self.calls % self.num_robots == 0:
+            self._log(room, robots)
+        else:
+            self.tracker.look(room, robots)
+        self.calls += 1
+        self.room = room
+        self.robots = robots
+
+    def done(self):
+        "Logs the last time-step and writes the sidecar."
+        if self.calls > 0:
+            self._log(self.room, self.robots)
+        self.pose_file.close()
+        self.event_file.close()
+        sidecar, poses, tiles = _files(self.path)
+        with open(sidecar, 'w') as f:
+            json.dump({'format': FORMAT,
+                       'num_robots': self.num_robots,
+                       'width': self.width,
+                       'height': self.height,
+                       'ticks': self.ticks,
+                       'events': self.event_file.length,
+                       'pose': POSE.descr,
+                       'event': EVENT.descr}, f, indent=1)
+
+
+def logger(path='trajectory'):
+    """
+    Returns an animation factory for runSimulation that logs every trial
+    with a TrajectoryLog. PATH may contain {trial}, replaced by the number of
+    the trial, so that the trials do not overwrite each other.
+    """
+    return numbered_trials(TrajectoryLog, path)
+
+
+class TrajectoryReplay:
+    """
+    A log written by TrajectoryLog, opened for reading. Nothing is read
+    before it is looked at: poses is an array of shape (ticks, num_robots)
+    of POSE records and events an array of EVENT records, both mapped onto
+    their files, so that indexing and slicing them reads only that part.
+    """
+    def __init__(self, path):
+        """
+        path - the name of the log, as given to TrajectoryLog
+        """
+        sidecar, poses, tiles = _files(path)
+        with open(sidecar) as f:
+            info = json.load(f)
+        if info['format'] != FORMAT:
+            raise ValueError('unknown trajectory log format %r' % info['format'])
+        self.num_robots = info['num_robots']
+        self.width = info['width']
+        self.height = info['height']
+        self.ticks = info['ticks']
+        if self.ticks * self.num_robots > 0:
+            self.poses = np.memmap(poses, POSE, 'r',
+                                   shape=(self.ticks, self.num_robots))
+        else:
+            self.poses = np.zeros((self.ticks, self.num_robots), dtype=POSE)
+        if info['events'] > 0:
+            self.events = np.memmap(tiles, EVENT, 'r', shape=(info['events'],))
+        else:
+            self.events = np.zeros(0, dtype=EVENT)
+
+    def __len__(self):
+        "The number of time-steps logged, the first being the start at 0."
+        return self.ticks
+
+    def robots(self, tick):
+        "Returns the robots after TICK time-steps, as RobotSnapshots."
+        return [RobotSnapshot(*pose) for pose in self.poses[tick].tolist()]
+
+    def cleaned(self, stop, start=0):
+        """
+        Returns an array of the numbers of the tiles first cleaned from
+        time-step START up to time-step STOP included, tiles being numbered
+        m * height + n as in ps2.RectangularRoom.
+        """
+        ticks = self.events['tick']
+        first = np.searchsorted(ticks, start, side='left')
+        last = np.searchsorted(ticks, stop, side='right')
+        return np.asarray(self.events['tile'][first:last])
+
+    def room(self, tick):
+        "Returns a ps2.RectangularRoom with the tiles clean after TICK time-steps."
+        from ps2 import RectangularRoom
+        room = RectangularRoom(self.width, self.height)
+        tiles = self.cleaned(tick)
+        np.frombuffer(room.tiles, dtype=np.uint8)[tiles] = 1
+        room.numCleanTiles = len(tiles)
+        return room
+
+    def play(self, start=0, stop=None, step=1, delay=0.2, viewer=None):
+        """
+        Shows time-steps START, START + STEP, ... before STOP of the log with
+        RobotVisualization, or VIEWER, a class with the same methods.
+        """
+        if viewer is None:
+            from ps2_visualize import RobotVisualization as viewer
+        if stop is None:
+            stop = self.ticks
+        anim = viewer(self.num_robots, self.width, self.height, delay)
+        room = self.room(start)
+        tiles = np.frombuffer(room.tiles, dtype=np.uint8)
+        previous = start
+        for tick in range(start, stop, step):
+            if tick > previous:
+                changed = self.cleaned(tick, previous + 1)
+                tiles[changed] = 1
+                room.numCleanTiles += len(changed)
+                previous = tick
+            anim.time = tick - 1
+            anim.update(room, self.robots(tick))
+        anim.done()
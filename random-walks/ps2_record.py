@@ -0,0 +1,274 @@
+# Problem Set 2:
+# Off-screen recording of simulated robots, as still images or an animation.
+# A FrameRecorder can stand in for ps2_visualize.RobotVisualization, without
+# a display and without slowing the simulation down to the speed of the
+# screen:
+#
+#     runSimulation(3, 1.0, 20, 20, 0.8, 1, StandardRobot,
+#                   animation=recorder('robots.png', stride=10))
+
+import math
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from ps2 import Position
+
+# the colours of dirty and clean tiles and of the robots
+DIRTY = (128, 128, 128)
+CLEAN = (255, 255, 255)
+ROBOT = (200, 0, 0)
+HEADING = (0, 0, 0)
+
+
+def _chunk(tag, data):
+    "Returns a PNG chunk."
+    return (struct.pack('>I', len(data)) + tag + data
+            + struct.pack('>I', zlib.crc32(tag + data)))
+
+
+def _header(width, height):
+    "Returns the signature and IHDR chunk of an 8-bit RGB PNG."
+    return (b'\x89PNG\r\n\x1a\n'
+            + _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+
+
+def _compress(image, level):
+    "Returns the compressed pixel data of an RGB image, rows unfiltered."
+    rows = image.reshape(image.shape[0], -1)
+    filtered = np.zeros((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 1:] = rows
+    return zlib.compress(filtered.tobytes(), level)
+
+
+def write_png(path, image, level=6):
+    """
+    Writes an RGB image to a PNG file.
+    path: the name of the file
+    image: an array of uint8 of shape (height, width, 3)
+    level: the zlib compression level, from 0 to 9
+    """
+    with open(path, 'wb') as f:
+        f.write(_header(image.shape[1], image.shape[0]))
+        f.write(_chunk(b'IDAT', _compress(image, level)))
+        f.write(_chunk(b'IEND', b''))
+
+
+class TileTracker:
+    """
+    Finds the tiles of a room cleaned since it last looked. A robot only
+    cleans the tile it moves to, so a tracker shown the robots after every
+    move, with look, only looks at the tiles under them, and goes through the
+    whole room only when the number of clean tiles says some were missed.
+    Tiles are numbered m * height + n, as in ps2.RectangularRoom.
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # a bit for every tile already found, bit k % 8 of byte k // 8
+        self.reported = bytearray(-(-width * height // 8))
+        self.num_cleaned = 0
+        self.found = []
+
+    def _scan(self, room):
+        "Returns an array of the numbers of all the clean tiles of the room."
+        if hasattr(room, 'tiles'):
+            return np.flatnonzero(np.frombuffer(room.tiles, dtype=np.uint8))
+        if hasattr(room, 'areTilesCleaned'):
+            tiles = np.arange(self.width * self.height)
+            return tiles[room.areTilesCleaned(tiles)]
+        return np.array([m * self.height + n
+                         for m in range(self.width)
+                         for n in range(self.height)
+                         if room.isTileCleaned(m, n)], dtype=np.int64)
+
+    def look(self, room, robots):
+        "Notes the tiles under the robots that were cleaned since the last look."
+        if room.getNumCleanedTiles() == self.num_cleaned:
+            return
+        reported = self.reported
+        for robot in robots:
+            position = robot.getRobotPosition()
+            m, n = int(position.getX()), int(position.getY())
+            tile = m * self.height + n
+            if (not reported[tile >> 3] >> (tile & 7) & 1
+                    and room.isTileCleaned(m, n)):
+                reported[tile >> 3] |= 1 << (tile & 7)
+                self.found.append(tile)
+                self.num_cleaned += 1
+
+    def changes(self, room, robots=None):
+        """
+        Returns an array of the numbers of the tiles cleaned since the last
+        call, looking at the tiles under ROBOTS first, if given.
+        """
+        if robots is not None:
+            self.look(room, robots)
+        found = np.array(self.found, dtype=np.int64)
+        self.found = []
+        if room.getNumCleanedTiles() != self.num_cleaned:
+            # some were cleaned away from where the robots were seen
+            tiles = self._scan(room)
+            reported = np.frombuffer(self.reported, dtype=np.uint8)
+            tiles = tiles[(reported[tiles >> 3] >> (tiles & 7) & 1) == 0]
+            np.bitwise_or.at(reported, tiles >> 3,
+                             np.left_shift(1, tiles & 7).astype(np.uint8))
+            self.num_cleaned += len(tiles)
+            found = np.concatenate((found, tiles))
+        return found
+
+
+class RobotSnapshot:
+    """
+    A robot as it was at one time-step, in a log or sent to a viewer, with
+    the methods of ps2.Robot that RobotVisualization uses to look at it.
+    """
+    def __init__(self, x, y, direction):
+        self.position = Position(x, y)
+        self.direction = direction
+
+    def getRobotPosition(self):
+        return self.position
+
+    def getRobotDirection(self):
+        return self.direction
+
+
+def numbered_trials(animation, path, **options):
+    """
+    Returns an animation factory for runSimulation that makes an ANIMATION,
+    a class called as animation(num_robots, width, height, path, **options),
+    for every trial. PATH may contain {trial}, replaced by the number of the
+    trial, so that the trials do not overwrite each other.
+    """
+    trials = [0]
+    def make(num_robots, width, height):
+        trial = trials[0]
+        trials[0] += 1
+        return animation(num_robots, width, height, path.format(trial=trial),
+                         **options)
+    return make
+
+
+class FrameRecorder:
+    """
+    Records a trial of the simulation as images, with the interface of
+    ps2_visualize.RobotVisualization: runSimulation calls update(room, robots)
+    before every move of a robot and done() at the end of the trial.
+    Only every STRIDE-th call of update makes a frame, and only the tiles
+    cleaned since the last frame, found under the robots, are redrawn. Frames are RGB arrays of SCALE
+    pixels a tile, written as numbered PNG files into a directory, or, when
+    PATH ends with .png, into a single animated PNG when the trial is done.
+    """
+    def __init__(self, num_robots, width, height, path='frames', stride=1,
+                 scale=8, delay=0.05, level=6):
+        """
+        num_robots, width, height - as for RobotVisualization
+        path - a directory for numbered PNG files, or the name of an
+            animated PNG file ending with .png
+        stride - the number of calls of update per frame (an int)
+        scale - the number of pixels of the side of a tile (an int)
+        delay - the number of seconds a frame is shown in an animated PNG
+        level - the zlib compression level, from 0 to 9
+        """
+        self.num_robots = num_robots
+        self.width = width
+        self.height = height
+        self.path = path
+        self.stride = stride
+        self.scale = scale
+        self.delay = delay
+        self.level = level
+        self.animated = path.lower().endswith('.png')
+        if not self.animated:
+            os.makedirs(path, exist_ok=True)
+
+        # a pixel a tile, the top row being the highest y as on screen
+        self.palette = np.array([DIRTY, CLEAN], dtype=np.uint8)
+        self.grid = np.zeros((height, width), dtype=np.uint8)
+        self.tracker = TileTracker(width, height)
+        self.time = 0
+        self.frames = []
+        self.num_frames = 0
+
+    def _update_tiles(self, room, robots):
+        "Copies the tiles cleaned since the last frame into the grid."
+        changed = self.tracker.changes(room, robots)
+        self.grid[self.height - 1 - changed % self.height,
+                  changed // self.height] = 1
+
+    def _draw_robot(self, image, position, direction):
+        "Draws a robot as a square with a dot towards its direction."
+        scale = self.scale
+        size = max(1, scale // 4)
+        for x, y, colour in ((position.getX(), position.getY(), ROBOT),
+                             (position.getX() + 0.4 * math.sin(math.radians(direction)),
+                              position.getY() + 0.4 * math.cos(math.radians(direction)),
+                              HEADING)):
+            column = int(x * scale)
+            row = int((self.height - y) * scale)
+            image[max(0, row - size):row + size,
+                  max(0, column - size):column + size] = colour
+
+    def render(self, robots):
+        """
+        Returns the current frame, an array of uint8 of shape
+        (height * scale, width * scale, 3).
+        """
+        tiles = self.palette[self.grid]
+        image = np.repeat(np.repeat(tiles, self.scale, axis=0), self.scale, axis=1)
+        for robot in robots:
+            self._draw_robot(image, robot.getRobotPosition(),
+                             robot.getRobotDirection())
+        return image
+
+    def update(self, room, robots):
+        "Records a frame of the room and robots every stride calls."
+        self.time += 1
+        if (self.time - 1) % self.stride != 0:
+            self.tracker.look(room, robots)
+            return
+        self._update_tiles(room, robots)
+        image = self.render(robots)
+        if self.animated:
+            self.frames.append(_compress(image, self.level))
+            self.frame_shape = image.shape
+        else:
+            write_png(os.path.join(self.path, 'frame%06d.png' % self.num_frames),
+                      image, self.level)
+        self.num_frames += 1
+
+    def done(self):
+        "Writes the animated PNG, if any."
+        if not self.animated or self.frames == []:
+            return
+        height, width = self.frame_shape[:2]
+        delay = struct.pack('>HH', int(round(self.delay * 1000)), 1000)
+        sequence = 0
+        with open(self.path, 'wb') as f:
+            f.write(_header(width, height))
+            f.write(_chunk(b'acTL', struct.pack('>II', len(self.frames), 0)))
+            for i, data in enumerate(self.frames):
+                f.write(_chunk(b'fcTL', struct.pack('>IIIII', sequence, width,
+                                                    height, 0, 0)
+                               + delay + b'\x00\x00'))
+                sequence += 1
+                if i == 0:
+                    f.write(_chunk(b'IDAT', data))
+                else:
+                    f.write(_chunk(b'fdAT', struct.pack('>I', sequence) + data))
+                    sequence += 1
+            f.write(_chunk(b'IEND', b''))
+        self.frames = []
+
+
+def recorder(path='frames', **options):
+    """
+    Returns an animation factory for runSimulation that records every trial
+    with a FrameRecorder. PATH may contain {trial}, replaced by the number of
+    the trial, so that the trials do not overwrite each other.
+    options - the other arguments of FrameRecorder
+    """
+    return numbered_trials(FrameRecorder, path, **options)
@@ -0,0 +1,114 @@
+# 6.00.2x Problem Set 2: Simulating robots
+# Parameter sweeps of the simulation over a pool of processes
+
+import concurrent.futures
+import multiprocessing
+import random
+import numpy as np
+
+from ps2 import runTrial
+
+
+def trialSeed(seed, point, trial):
+    """
+    Return the seed of the random module for one trial of a sweep. Every
+    (point, trial) pair gets its own stream, spawned from SEED, so a trial
+    draws the same numbers whichever process runs it and whatever ran
+    before it.
+    seed: an int, the seed of the whole sweep
+    point: an int, the index of the point in the sweep
+    trial: an int, the index of the trial at that point
+    returns: an int
+    """
+    state = np.random.SeedSequence(seed, spawn_key=(point, trial)).generate_state(4)
+    return int.from_bytes(state.tobytes(), 'little')
+
+
+def runTrials(job):
+    """
+    Runs some trials of one point of a sweep, each seeded with trialSeed, and
+    returns the index of the point, the indices of the trials and the
+    number of time-steps of every trial. Leaves the state of the random
+    module as it found it.
+    job: a tuple (seed, point, trials, parameters), parameters being the
+        arguments of runTrial
+    """
+    seed, point, trials, parameters = job
+    state = random.getstate()
+    try:
+        times = []
+        for trial in trials:
+            random.seed(trialSeed(seed, point, trial))
+            times.append(runTrial(*parameters))
+    finally:
+        random.setstate(state)
+    return point, trials, times
+
+
+def runSweep(points, num_trials, seed=0, workers=None, chunksize=None):
+    """
+    Runs NUM_TRIALS trials of the simulation at every point of a parameter
+    grid over a pool of processes, and yields the times of every point as
+    soon as all its trials are done, so a sweep keeps every core busy and
+    its results can be used while it runs.
+    Every trial has its own random numbers, from trialSeed, so the times are
+    the same, bit for bit, whatever the number of workers and the chunks.
+    points: a list of tuples (num_robots, speed, width, height, min_coverage,
+        robot_type), the arguments of runTrial, robot_type being a class at
+        the top level of a module so that it can be sent to the workers
+    num_trials: an int (num_trials > 0)
+    seed: an int, the seed of the whole sweep
+    workers: the number of processes to use, by default the number of CPUs;
+        with 1 the trials are run in this process
+    chunksize: the number of trials of a point sent to a worker at once, by
+        default enough for about four chunks per worker
+    yields: pairs (index, times), index being the position of the point in
+    POINTS and times an array of the number of time-steps of every trial,
+    in the order of the trials
+    """
+    points = list(points)
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if chunksize is None:
+        chunksize = max(1, -(-len(points) * num_trials // (4 * workers)))
+    jobs = [(seed, point, range(start, min(start + chunksize, num_trials)),
+             tuple(parameters))
+            for point, parameters in enumerate(points)
+            for start in range(0, num_trials, chunksize)]
+
+    times = [np.zeros(num_trials, dtype=int) for point in points]
+    remaining = [num_trials] * len(points)
+    if workers == 1:
+        results = map(runTrials, jobs)
+        pool = None
+    else:
+        pool = concurrent.futures.ProcessPoolExecutor(workers)
+        futures = [pool.submit(runTrials, job) for job in jobs]
+        results = (future.result()
+                   for future in concurrent.futures.as_completed(futures))
+    try:
+        for point, trials, pointTimes in results:
+            times[point][list(trials)] = pointTimes
+            remaining[point] -= len(trials)
+            if remaining[point] == 0:
+                yield point, times[point]
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def sweepMeans(points, num_trials, seed=0, workers=None):
+    """
+    Runs the sweep of runSweep and returns the mean number of time-steps at
+    every point, in the order of POINTS.
+    """
+    means = [None] * len(points)
+    for point, times in runSweep(points, num_trials, seed, workers):
+        means[point] = np.mean(times)
+    return means
+
+
+#TESTING
+#from ps2 import StandardRobot, RandomWalkRobot
+#if __name__ == '__main__':
+#    print(sweepMeans([(n, 1.0, 20, 20, 0.8, StandardRobot) for n in range(1, 11)], 20))
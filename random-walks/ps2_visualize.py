@@ -80,11 +80,10 @@ class RobotVisualization:
 
     def update(self, room, robots):
         "Redraws the visualization with the specified room and robot state."
-        # Removes a gray square for any tiles have been cleaned.
-        for i in range(self.width):
-            for j in range(self.height):
-                if room.isTileCleaned(i, j):
-                    self.w.delete(self.tiles[(i, j)])
+        # Removes a gray square for any tiles have been cleaned, looking only
+        # at the squares still drawn.
+        for tile in [tile for tile in self.tiles if room.isTileCleaned(*tile)]:
+            self.w.delete(self.tiles.pop(tile))
         # Delete all existing robots.
         if self.robots:
             for robot in self.robots:
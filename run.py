@@ -0,0 +1,238 @@
+"""
+Command line entry point for the problem sets.
+
+Every workload is a subcommand, and the module it needs is only imported
+when that subcommand runs:
+
+    python run.py transport --limit 10 --solver branch_and_bound
+    python run.py transport --compare
+    python run.py benchmark --sizes 10 100 --repeat 3
+    python run.py robots --robots 3 --width 20 --height 20 --robot random_walk
+    python run.py robots --plot 1
+    python run.py robots --trials 1 --record robots.png --stride 10
+    python run.py robots --trials 1 --live
+    python run.py robots --trials 1 --log run
+    python run.py robots --trials 1 --width 5000 --height 5000 --room sparse
+    python run.py replay run0 --start 100 --step 5
+    python run.py virus --drug
+    python run.py climate --data climate-change/data.csv
+    python run.py whisky
+"""
+
+import argparse
+import functools
+import importlib
+import os
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def _module(directory, name):
+    """
+    Imports the module name from the problem set in directory.
+    """
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(name)
+
+
+def transport(args):
+    ps1 = _module('transport-optimization', 'ps1')
+    if args.herd:
+        cows = ps1.load_herd(args.data, cache=args.cache_dir or True)
+    else:
+        cows = ps1.load_cows(args.data)
+    if args.compare:
+        ps1.compare_cow_transport_algorithms(cows, args.limit)
+        return
+    if args.solver == 'online':
+        ps1_online = _module('transport-optimization', 'ps1_online')
+        for trip in ps1_online.online_cow_transport(cows, args.limit):
+            print(trip)
+        return
+    solver = getattr(ps1, args.solver + '_cow_transport')
+    allocation = solver(cows, args.limit)
+    for trip in allocation:
+        print(trip)
+    print('%d trips, lower bound %d' % (len(allocation),
+                                        allocation.lower_bound))
+
+
+def benchmark(args):
+    ps1_benchmark = _module('transport-optimization', 'ps1_benchmark')
+    ps1_benchmark.main(args.options)
+
+
+def robots(args):
+    ps2 = _module('random-walks', 'ps2')
+    if args.plot == 1:
+        ps2.showPlot1('Time it takes 1 to 10 robots to clean 80% of a room',
+                      'Number of robots', 'Time-steps')
+    elif args.plot == 2:
+        ps2.showPlot2('Time it takes 2 robots to clean 80% of variously '
+                      'shaped rooms', 'Aspect ratio', 'Time-steps')
+    else:
+        robot_type = {'standard': ps2.StandardRobot,
+                      'random_walk': ps2.RandomWalkRobot}[args.robot]
+        room_type = {'bytes': ps2.RectangularRoom,
+                     'bitset': ps2.BitsetRoom,
+                     'sparse': ps2.SparseRoom}[args.room]
+        animation = None
+        if args.record is not None:
+            ps2_record = _module('random-walks', 'ps2_record')
+            animation = ps2_record.recorder(args.record, stride=args.stride)
+        elif args.live:
+            ps2_live = _module('random-walks', 'ps2_live')
+            animation = functools.partial(ps2_live.LiveView, stride=args.stride)
+        elif args.log is not None:
+            ps2_log = _module('random-walks', 'ps2_log')
+            animation = ps2_log.logger(args.log + '{trial}')
+        trials = args.trials
+        if trials is None:
+            # a window for every trial is more than anyone wants to close
+            trials = 1 if args.live else 30
+        print(ps2.runSimulation(args.robots, args.speed, args.width,
+                                args.height, args.coverage, trials,
+                                robot_type, animation, room_type))
+
+
+def replay(args):
+    ps2_log = _module('random-walks', 'ps2_log')
+    ps2_log.TrajectoryReplay(args.log).play(args.start, args.stop, args.step,
+                                            args.delay)
+
+
+def virus(args):
+    ps3b = _module('virus-treatment', 'ps3b')
+    if args.drug:
+        ps3b.simulationWithDrug(args.viruses, args.max_pop, args.birth_prob,
+                                args.clear_prob, {'guttagonol': False},
+                                args.mut_prob, args.trials)
+    else:
+        ps3b.simulationWithoutDrug(args.viruses, args.max_pop,
+                                   args.birth_prob, args.clear_prob,
+                                   args.trials)
+
+
+def climate(args):
+    ps4 = _module('climate-change', 'ps4')
+    ps4.main(args.data)
+    import pylab
+    pylab.show()
+
+
+def whisky(args):
+    # a script rather than a module, run where its data files are
+    directory = os.path.join(ROOT, 'whiskey-classification')
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        runpy.run_path(os.path.join(directory, 'homework code bokeh.py'),
+                       run_name='__main__')
+    finally:
+        os.chdir(cwd)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Run the workloads of the problem sets.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    command = commands.add_parser('transport',
+                                  help='allocate cows to spaceship trips')
+    command.add_argument('--data', default=os.path.join(
+        ROOT, 'transport-optimization', 'ps1_cow_data.txt'))
+    command.add_argument('--limit', type=int, default=10)
+    command.add_argument('--solver', default='greedy',
+                         choices=['greedy', 'local_search', 'brute_force',
+                                  'branch_and_bound', 'parallel', 'dynamic',
+                                  'online'])
+    command.add_argument('--herd', action='store_true',
+                         help='load the cows into a cached Herd')
+    command.add_argument('--cache-dir', metavar='DIRECTORY',
+                         help='keep the cached Herd in DIRECTORY instead of '
+                         'next to the data file')
+    command.add_argument('--compare', action='store_true',
+                         help='compare all the solvers')
+    command.set_defaults(run=transport)
+
+    command = commands.add_parser('benchmark',
+                                  help='benchmark the cow transport solvers, '
+                                  'taking the options of ps1_benchmark')
+    command.set_defaults(run=benchmark)
+
+    command = commands.add_parser('robots', help='simulate cleaning robots')
+    command.add_argument('--robots', type=int, default=3)
+    command.add_argument('--speed', type=float, default=1.0)
+    command.add_argument('--width', type=int, default=20)
+    command.add_argument('--height', type=int, default=20)
+    command.add_argument('--coverage', type=float, default=0.8)
+    command.add_argument('--trials', type=int,
+                         help='the number of trials, 30 or 1 with --live')
+    command.add_argument('--robot', default='standard',
+                         choices=['standard', 'random_walk'])
+    command.add_argument('--room', default='bytes',
+                         choices=['bytes', 'bitset', 'sparse'],
+                         help='keep the clean tiles a byte a tile, a bit a '
+                         'tile, or only in the blocks the robots reached')
+    command.add_argument('--plot', type=int, choices=[1, 2],
+                         help='show plot 1 or 2 of problem 6 instead')
+    command.add_argument('--record', metavar='PATH',
+                         help='record the trials as frames in the directory '
+                         'PATH, or as an animated PNG if PATH ends with .png; '
+                         '{trial} in PATH is replaced by the trial number')
+    command.add_argument('--live', action='store_true',
+                         help='show the trials in a window each that never '
+                         'holds the simulation up')
+    command.add_argument('--stride', type=int, default=1,
+                         help='record or show a frame every STRIDE robot '
+                         'moves')
+    command.add_argument('--log', metavar='PATH',
+                         help='log the trials to PATH0, PATH1, ... for replay')
+    command.set_defaults(run=robots)
+
+    command = commands.add_parser('replay',
+                                  help='show a trial logged by robots --log')
+    command.add_argument('log', help='the name of the log, such as PATH0')
+    command.add_argument('--start', type=int, default=0)
+    command.add_argument('--stop', type=int)
+    command.add_argument('--step', type=int, default=1)
+    command.add_argument('--delay', type=float, default=0.2)
+    command.set_defaults(run=replay)
+
+    command = commands.add_parser('virus',
+                                  help='simulate a virus population')
+    command.add_argument('--drug', action='store_true',
+                         help='resistant viruses treated with guttagonol')
+    command.add_argument('--viruses', type=int, default=100)
+    command.add_argument('--max-pop', type=int, default=1000)
+    command.add_argument('--birth-prob', type=float, default=0.1)
+    command.add_argument('--clear-prob', type=float, default=0.05)
+    command.add_argument('--mut-prob', type=float, default=0.005)
+    command.add_argument('--trials', type=int, default=5)
+    command.set_defaults(run=virus)
+
+    command = commands.add_parser('climate',
+                                  help='fit models to temperature data')
+    command.add_argument('--data', default=os.path.join(
+        ROOT, 'climate-change', 'data.csv'))
+    command.set_defaults(run=climate)
+
+    command = commands.add_parser('whisky',
+                                  help='run the whisky classification script')
+    command.set_defaults(run=whisky)
+
+    # the options of the benchmark are left for ps1_benchmark to parse
+    args, options = parser.parse_known_args(argv)
+    if options != [] and args.run is not benchmark:
+        parser.error('unrecognized arguments: ' + ' '.join(options))
+    args.options = options
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,186 +1,1100 @@
-###########################
-# 6.00.2x Problem Set 1: Space Cows 
-
-#from ps1_partition import get_partitions
-import time
-import operator
-
-#================================
-# Part A: Transporting Space Cows
-#================================
-
-def load_cows(filename):
-    """
-    Read the contents of the given file.  Assumes the file contents contain
-    data in the form of comma-separated cow name, weight pairs, and return a
-    dictionary containing cow names as keys and corresponding weights as values.
-    Parameters:
-    filename - the name of the data file as a string
-    Returns:
-    a dictionary of cow name (string), weight (int) pairs
-    """
-    cow_dict = dict()
-    f = open(filename, 'r')
-    for line in f:
-        line_data = line.split(',')
-        cow_dict[line_data[0]] = int(line_data[1])
-    return cow_dict
-
-
-# Problem 1
-def greedy_cow_transport(cows, limit=10):
-    """
-    Uses a greedy heuristic to determine an allocation of cows that attempts to
-    minimize the number of spaceship trips needed to transport all the cows. The
-    returned allocation of cows may or may not be optimal.
-    The greedy heuristic should follow the following method:
-    1. As long as the current trip can fit another cow, add the largest cow that will fit
-        to the trip
-    2. Once the trip is full, begin a new trip to transport the remaining cows
-    Does not mutate the given dictionary of cows.
-    Parameters:
-    cows - a dictionary of name (string), weight (int) pairs
-    limit - weight limit of the spaceship (an int)
-    Returns:
-    A list of lists, with each inner list containing the names of cows
-    transported on a particular trip and the overall list containing all the
-    trips
-    """
-    cowsCopy = sorted(cows.items(), key=operator.itemgetter(1), reverse=True)
-    tempResult = []
-    finalResult = []
-    totalWeight = 0
-    i = 0
-    
-    while len(cowsCopy) != 0:
-        if i == len(cowsCopy):
-            finalResult.append(tempResult)
-            tempResult = []
-            totalWeight = 0
-            i = 0
-        elif totalWeight + cowsCopy[i][1] <= limit:    
-            tempResult.append(cowsCopy[i][0])
-            totalWeight += cowsCopy[i][1]
-            del cowsCopy[i]
-        else:
-            i += 1
-    
-    if tempResult != []:
-        finalResult.append(tempResult)
-            
-    return finalResult
-
-
-# Problem 2
-def brute_force_cow_transport(cows,limit=10):
-    """
-    Finds the allocation of cows that minimizes the number of spaceship trips
-    via brute force.  The brute force algorithm should follow the following method:
-    1. Enumerate all possible ways that the cows can be divided into separate trips
-    2. Select the allocation that minimizes the number of trips without making any trip
-        that does not obey the weight limitation
-    Does not mutate the given dictionary of cows.
-    Parameters:
-    cows - a dictionary of name (string), weight (int) pairs
-    limit - weight limit of the spaceship (an int)
-    Returns:
-    A list of lists, with each inner list containing the names of cows
-    transported on a particular trip and the overall list containing all the
-    trips
-    """
-    
-    result = []
-    # for a given transport scheme
-    for transport in get_partitions(cows):
-        transApproved = True
-        # for every load in transport scheme
-        for i in range(len(transport)):
-            totalWeight = 0
-            # for every element of load
-            for j in range(len(transport[i])):
-                # sum weight
-                totalWeight += cows.get(transport[i][j])
-            #if the weight is above limit
-            if totalWeight > limit:
-                # reject the whole transport scheme
-                transApproved = False
-                break
-        if transApproved: 
-            result.append(transport)
-    
-    #choose the scheme with min number of loads
-    min = len(cows)+1
-    finalResult = []
-    
-    for i in range(len(result)):
-        if len(result[i]) < min:
-            min = len(result[i])
-            finalResult = result[i]
-    return finalResult
-
-        
-# Problem 3
-def compare_cow_transport_algorithms():
-    """
-    Using the data from ps1_cow_data.txt and the specified weight limit, run your
-    greedy_cow_transport and brute_force_cow_transport functions here. Use the
-    default weight limits of 10 for both greedy_cow_transport and
-    brute_force_cow_transport.
-    Print out the number of trips returned by each method, and how long each
-    method takes to run in seconds.
-    Returns:
-    Does not return anything.
-    """
-
-    print('The greedy_cow_transport takes ' + str(len(greedy_cow_transport(cows,limit=10))) + ' transports')
-    print('The brute_force_cow_transport takes ' + str(len(brute_force_cow_transport(cows,limit=10))) + ' transports')
-    print()
-    start = time.time()
-    greedy_cow_transport(cows, limit=10)
-    end = time.time()
-    timeGreedy = end - start 
-    print('The greedy_cow_transport takes ' + str(timeGreedy) + ' seconds')
-    
-    start = time.time()
-    brute_force_cow_transport(cows, limit=10)
-    end = time.time()
-    timeBrute = end - start
-    print('The brute_force_cow_transport takes ' + str(timeBrute) + ' seconds')
-
-
-"""
-Here is some test data for you to see the results of your algorithms with. 
-Do not submit this along with any of your answers. Uncomment the last two
-lines to print the result of your problem.
-"""
-
-cows = load_cows("ps1_cow_data.txt")
-limit = 100
-#print(cows)
-
-print(greedy_cow_transport(cows))
-print()
-print(brute_force_cow_transport(cows))
-print()
-compare_cow_transport_algorithms()
-
-
-#TESTING
-#greedy_cow_transport({'Polaris': 20, 'Louis': 45, 'Clover': 5, 'Patches': 60, 'Lotus': 10, 'Milkshake': 75, 'Horns': 50, 'Muscles': 65, 'Miss Bella': 15, 'MooMoo': 85}, 100)
-#[['MooMoo', 'Miss Bella'], ['Milkshake', 'Polaris', 'Clover'], ['Muscles', 'Lotus'], ['Patches'], ['Horns', 'Louis']]
-
-#greedy_cow_transport({'Buttercup': 72, 'Coco': 10, 'Willow': 35, 'Daisy': 50, 'Dottie': 85, 'Rose': 50, 'Lilly': 24, 'Patches': 12, 'Abby': 38, 'Betsy': 65}, 100)
-#[['Dottie', 'Patches'], ['Buttercup', 'Lilly'], ['Betsy', 'Willow'], ['Daisy', 'Rose'], ['Abby', 'Coco']]
-
-#greedy_cow_transport({'Buttercup': 11, 'Starlight': 54, 'Willow': 59, 'Luna': 41, 'Rose': 42, 'Abby': 28, 'Betsy': 39, 'Coco': 59}, 120)
-#[['Coco', 'Willow'], ['Starlight', 'Rose', 'Buttercup'], ['Luna', 'Betsy', 'Abby']]
-
-#brute_force_cow_transport({'Lotus': 40, 'Horns': 25, 'Milkshake': 40, 'Boo': 20, 'Miss Bella': 25, 'MooMoo': 50}, 100)
-#[['MooMoo', 'Horns', 'Miss Bella'], ['Lotus', 'Milkshake', 'Boo']]
-
-#brute_force_cow_transport({'Daisy': 50, 'Buttercup': 72, 'Betsy': 65}, 75)
-#[['Buttercup'], ['Daisy'], ['Betsy']]
-
-#brute_force_cow_transport({'Starlight': 54, 'Buttercup': 11, 'Luna': 41, 'Betsy': 39}, 145)
-#[['Betsy', 'Buttercup', 'Starlight', 'Luna']]
-
+###########################
+# 6.00.2x Problem Set 1: Space Cows 
+
+from ps1_partition import feasible_partitions
+from ps1_bounds import Allocation, lower_bound, lower_bound_l2_histogram
+import os
+import time
+import hashlib
+import operator
+import bisect
+import random
+import collections.abc
+import multiprocessing
+import concurrent.futures
+import numpy as np
+
+#================================
+# Part A: Transporting Space Cows
+#================================
+
+def load_cows(filename):
+    """
+    Read the contents of the given file.  Assumes the file contents contain
+    data in the form of comma-separated cow name, weight pairs, and return a
+    dictionary containing cow names as keys and corresponding weights as values.
+    Parameters:
+    filename - the name of the data file as a string
+    Returns:
+    a dictionary of cow name (string), weight (int) pairs
+    """
+    cow_dict = dict()
+    with open(filename, 'r') as f:
+        for line in f:
+            line_data = line.split(',')
+            cow_dict[line_data[0]] = int(line_data[1])
+    return cow_dict
+
+
+class Herd(collections.abc.Mapping):
+    """
+    A herd of cows held compactly: a list of names and an int32 NumPy array
+    of the weights in the same order. It reads like the
+    dictionary of name, weight pairs returned by load_cows, and every
+    transport solver takes it in place of that dictionary, working on the
+    array directly.
+    """
+    def __init__(self, names, weights):
+        """
+        names - a list of cow names (strings)
+        weights - the weights of the cows (ints), in the same order
+        """
+        self.names = names
+        self.weights = np.asarray(weights, dtype=np.int32)
+        self._index = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __getitem__(self, name):
+        # the index of every name is only built when a cow is looked up
+        if self._index is None:
+            self._index = {n: i for i, n in enumerate(self.names)}
+        return int(self.weights[self._index[name]])
+
+    def items(self):
+        return zip(self.names, self.weights.tolist())
+
+    def values(self):
+        return self.weights.tolist()
+
+
+def load_herd(filename, cache=False):
+    """
+    Reads the same comma-separated cow name, weight pairs as load_cows into a
+    Herd, reading the whole file at once and converting all the weights in
+    one NumPy call. Like load_cows, it ignores any fields after the weight.
+    With cache set, the herd is also written, next to the file or into the
+    directory cache, as a .npy array of the weights and a file of the names,
+    and later calls read it from there, memory-mapping the weights, as long
+    as the data file still has the size and the modification time it had
+    when it was cached. In a cache directory the files are named after the
+    full path of the data file, so that files of the same name in different
+    directories are kept apart.
+    Parameters:
+    filename - the name of the data file as a string
+    cache - whether to use the cached binary copy of the herd, or the
+        name of the directory to keep it in
+    Returns:
+    a Herd
+    """
+    cacheName = filename
+    if isinstance(cache, str):
+        os.makedirs(cache, exist_ok=True)
+        path = os.path.abspath(filename)
+        cacheName = os.path.join(cache, os.path.basename(filename) + '.'
+                                 + hashlib.sha1(path.encode()).hexdigest()[:16])
+    weightsFile = cacheName + '.weights.npy'
+    namesFile = cacheName + '.names'
+    source = os.stat(filename)
+    stamp = '%d %d' % (source.st_size, source.st_mtime_ns)
+    if cache and os.path.exists(weightsFile) and os.path.exists(namesFile):
+        with open(namesFile, 'r') as f:
+            names = f.read().split('\n')
+        # the first line is the stamp of the data file the cache was made from
+        if names[0] == stamp:
+            names = names[1:]
+            if names == ['']:
+                names = []
+            return Herd(names, np.load(weightsFile, mmap_mode='r'))
+
+    with open(filename, 'r') as f:
+        lines = [line for line in f.read().splitlines() if line.strip() != '']
+    fields = [line.split(',', 2) for line in lines]
+    names = [line_data[0] for line_data in fields]
+    herd = Herd(names, np.array([line_data[1] for line_data in fields],
+                                dtype=np.int32))
+
+    if cache:
+        np.save(weightsFile, herd.weights)
+        # written last, so that a stamp only ever goes with its weights
+        with open(namesFile, 'w') as f:
+            f.write('\n'.join([stamp] + names))
+    return herd
+
+
+def _cow_lists(cows):
+    """
+    Returns the names and the weights of the cows, a dictionary of name,
+    weight pairs or a Herd, as two lists in the order of the herd.
+    """
+    if isinstance(cows, Herd):
+        return list(cows.names), cows.weights.tolist()
+    return list(cows.keys()), list(cows.values())
+
+
+def _sorted_cows(cows):
+    """
+    Returns the names and the weights of the cows, a dictionary of name,
+    weight pairs or a Herd, as two lists sorted from the heaviest cow to the
+    lightest, keeping the order of the herd among cows of the same weight.
+    """
+    if isinstance(cows, Herd):
+        order = np.argsort(-cows.weights.astype(np.int64), kind='stable')
+        return [cows.names[i] for i in order.tolist()], \
+            cows.weights[order].tolist()
+    cowsSorted = sorted(cows.items(), key=operator.itemgetter(1), reverse=True)
+    return ([name for name, weight in cowsSorted],
+            [weight for name, weight in cowsSorted])
+
+
+def _histogram(cows):
+    """
+    Returns the cows, a dictionary of name, weight pairs or a Herd, as their
+    distinct weights from the heaviest to the lightest, the number of cows
+    of every weight and the names of the cows of every weight in the order
+    of the herd, as three lists.
+    """
+    if isinstance(cows, Herd):
+        # heaviest first, keeping the order of the herd among equal weights;
+        # in the smallest type that holds them, the stable sort of small
+        # numbers is a radix sort
+        weights = cows.weights.astype(np.int64)
+        if len(weights) > 0:
+            weights = weights.max() - weights
+            weights = weights.astype(np.min_scalar_type(weights.max()))
+        order = np.argsort(weights, kind='stable')
+        weights = cows.weights[order]
+        starts = np.flatnonzero(np.diff(weights, prepend=weights[:1] + 1))
+        ends = np.append(starts[1:], len(weights)).tolist()
+        starts = starts.tolist()
+        names = list(map(cows.names.__getitem__, order.tolist()))
+        return (weights[starts].tolist(),
+                [end - start for start, end in zip(starts, ends)],
+                [names[start:end] for start, end in zip(starts, ends)])
+    namesByWeight = {}
+    for name, weight in cows.items():
+        names = namesByWeight.get(weight)
+        if names is None:
+            namesByWeight[weight] = [name]
+        else:
+            names.append(name)
+    distinct = sorted(namesByWeight, reverse=True)
+    return (distinct, [len(namesByWeight[w]) for w in distinct],
+            [namesByWeight[w] for w in distinct])
+
+
+def _expand(runs, names):
+    """
+    Hands out the names of the cows of every weight, in order, to the trips
+    of the given runs. A run is a pair (pattern, times) of times trips with
+    the same pattern, a list of (j, c) pairs meaning c cows of the weight
+    with names[j].
+    Returns a list of trips, each a list of cow names.
+    """
+    taken = [0] * len(names)
+    trips = []
+    for pattern, times in runs:
+        for i in range(times):
+            trip = []
+            for j, c in pattern:
+                trip.extend(names[j][taken[j]:taken[j] + c])
+                taken[j] += c
+            trips.append(trip)
+    return trips
+
+
+def _pattern_fit(distinct, counts, limit):
+    """
+    Packs trips one after another, each time adding the largest cow left that
+    still fits, until no cow left fits and a new trip has to be started.
+    The cows are only counted by weight, so a trip is found as a pattern, a
+    list of (j, c) pairs meaning c cows of weight distinct[j], and is then
+    repeated as long as there are cows left for it, which gives the same
+    trips as packing every one of them anew. The weights with no cows left
+    are skipped through a union-find of the next weight with cows, so the
+    time depends on the number of distinct weights and of different trips,
+    not on the number of cows.
+    Parameters:
+    distinct - the distinct cow weights (ints) in decreasing order
+    counts - the number of cows of every weight
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    A list of (pattern, times) pairs, one for every run of equal trips
+    """
+    counts = list(counts)
+    k = len(distinct)
+    ascending = distinct[::-1]
+    # following nextLeft from j leads to the first weight from j on with
+    # cows left, or to k
+    nextLeft = list(range(k + 1))
+
+    def find(j):
+        root = j
+        while nextLeft[root] != root:
+            root = nextLeft[root]
+        while nextLeft[j] != root:
+            nextLeft[j], j = root, nextLeft[j]
+        return root
+
+    left = sum(counts)
+    runs = []
+    while left > 0:
+        first = find(0)
+        if distinct[first] > limit:
+            raise ValueError('a cow is heavier than the weight limit')
+        room = limit
+        pattern = []
+        j = first
+        while True:
+            # skip straight to the largest weight left that still fits
+            j = find(max(j, k - bisect.bisect_right(ascending, room)))
+            if j == k:
+                break
+            c = min(counts[j], room // distinct[j])
+            pattern.append((j, c))
+            room -= c * distinct[j]
+            j += 1
+        times = min(counts[j] // c for j, c in pattern)
+        for j, c in pattern:
+            counts[j] -= c * times
+            left -= c * times
+            if counts[j] == 0:
+                nextLeft[j] = j + 1
+        runs.append((pattern, times))
+    return runs
+
+
+def _largest_fit(weights, limit):
+    """
+    Packs trips one after another, each time adding the largest cow left that
+    still fits, until no cow left fits and a new trip has to be started.
+    The cows left are kept in a union-find over the positions of the sorted
+    weights, where every position points towards the nearest position below
+    it whose cow is still left, so each cow is found in almost constant time
+    after one bisection.
+    Parameters:
+    weights - a list of cow weights (ints) sorted in increasing order
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    A list of trips, each a list of indices into weights
+    """
+    n = len(weights)
+    # position p stands for weights[p - 1], position 0 means no cow left
+    below = list(range(n + 1))
+
+    def largest_left(p):
+        root = p
+        while below[root] != root:
+            root = below[root]
+        while below[p] != root:
+            below[p], p = root, below[p]
+        return root
+
+    trips = []
+    left = n
+    while left > 0:
+        room = limit
+        trip = []
+        p = largest_left(bisect.bisect_right(weights, room))
+        if p == 0:
+            raise ValueError('a cow is heavier than the weight limit')
+        while p != 0:
+            trip.append(p - 1)
+            room -= weights[p - 1]
+            below[p] = p - 1
+            left -= 1
+            p = largest_left(bisect.bisect_right(weights, room, 0, p))
+        trips.append(trip)
+    return trips
+
+
+def _first_fit(weights, limit):
+    """
+    Puts every cow, in the given order, on the earliest trip that still has
+    room for it. The room of the trips is kept in a tree of maxima over the
+    trip numbers, where trips not started yet have the whole limit as room,
+    so the earliest trip with enough room is found in logarithmic time.
+    Parameters:
+    weights - a list of cow weights (ints), heaviest first for first-fit
+        decreasing
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    A list of trips, each a list of indices into weights
+    """
+    size = 1
+    while size < len(weights):
+        size *= 2
+    room = [limit] * (2 * size)
+    trips = []
+    for i, w in enumerate(weights):
+        if w > limit:
+            raise ValueError('a cow is heavier than the weight limit')
+        node = 1
+        while node < size:
+            node *= 2
+            if room[node] < w:
+                node += 1
+        slot = node - size
+        if slot == len(trips):
+            trips.append([])
+        trips[slot].append(i)
+        room[node] -= w
+        # update the maxima above the trip, stopping once one is unchanged
+        node //= 2
+        while node > 0:
+            left, right = room[2 * node], room[2 * node + 1]
+            most = left if left > right else right
+            if room[node] == most:
+                break
+            room[node] = most
+            node //= 2
+    return trips
+
+
+def _best_fit(weights, limit):
+    """
+    Puts every cow, in the given order, on the trip with the least room left
+    that still fits it, or on a new trip if none does. The trips are grouped
+    by the room they have left and the distinct rooms are kept sorted, so
+    the best trip is found by bisection.
+    Parameters:
+    weights - a list of cow weights (ints), heaviest first for best-fit
+        decreasing
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    A list of trips, each a list of indices into weights
+    """
+    rooms = []
+    tripsWithRoom = {}
+    trips = []
+    for i, w in enumerate(weights):
+        if w > limit:
+            raise ValueError('a cow is heavier than the weight limit')
+        j = bisect.bisect_left(rooms, w)
+        if j == len(rooms):
+            slot = len(trips)
+            trips.append([i])
+            room = limit - w
+        else:
+            room = rooms[j]
+            slot = tripsWithRoom[room].pop()
+            if tripsWithRoom[room] == []:
+                del tripsWithRoom[room]
+                del rooms[j]
+            trips[slot].append(i)
+            room -= w
+        # a full trip is never looked at again
+        if room > 0:
+            if room not in tripsWithRoom:
+                tripsWithRoom[room] = []
+                bisect.insort(rooms, room)
+            tripsWithRoom[room].append(slot)
+    return trips
+
+
+# Problem 1
+def greedy_cow_transport(cows, limit=10, method='largest'):
+    """
+    Uses a greedy heuristic to determine an allocation of cows that attempts to
+    minimize the number of spaceship trips needed to transport all the cows. The
+    returned allocation of cows may or may not be optimal.
+    The greedy heuristic should follow the following method:
+    1. As long as the current trip can fit another cow, add the largest cow that will fit
+        to the trip
+    2. Once the trip is full, begin a new trip to transport the remaining cows
+    Two other heuristics can be chosen with method. Both go through the cows
+    from the largest to the smallest: 'first_fit' puts each cow on the
+    earliest trip with room for it and 'best_fit' on the trip with the least
+    room left that still fits it.
+    The default one works on the number of cows of every weight, see
+    _pattern_fit, and apart from handing out the names takes time that
+    depends on the number of distinct weights rather than of cows, unless
+    most weights are distinct, when it packs cow by cow with _largest_fit.
+    The other two take O(n log n) time for n cows.
+    The result is an Allocation, which also holds a lower bound on the number
+    of trips from ps1_bounds and so the gap to the best allocation at most.
+    Does not mutate the given cows.
+    Parameters:
+    cows - a dictionary of name (string), weight (int) pairs, or a Herd
+    limit - weight limit of the spaceship (an int)
+    method - 'largest' (the default), 'first_fit' or 'best_fit'
+    Returns:
+    A list of lists, with each inner list containing the names of cows
+    transported on a particular trip and the overall list containing all the
+    trips
+    Raises ValueError if some cow is heavier than the limit.
+    """
+    if isinstance(cows, Herd):
+        numDistinct = len(np.unique(cows.weights))
+    else:
+        numDistinct = len(set(cows.values()))
+    if method == 'largest' and 2 * numDistinct <= len(cows):
+        distinct, counts, names = _histogram(cows)
+        return Allocation(_expand(_pattern_fit(distinct, counts, limit),
+                                  names),
+                          lower_bound(distinct, limit, counts))
+    names, weights = _sorted_cows(cows)
+    if method == 'largest':
+        # too few cows of the same weight for patterns to pay: the cows are
+        # packed one by one, lightest first, so the first cow of a weight in
+        # the herd is the last of them here and the first taken
+        names.reverse()
+        weights.reverse()
+        return Allocation([[names[i] for i in trip]
+                           for trip in _largest_fit(weights, limit)],
+                          lower_bound(weights, limit))
+    if method == 'first_fit':
+        trips = _first_fit(weights, limit)
+    elif method == 'best_fit':
+        trips = _best_fit(weights, limit)
+    else:
+        raise ValueError('unknown method ' + repr(method))
+    return Allocation([[names[i] for i in trip] for trip in trips],
+                      lower_bound(weights, limit))
+
+
+def _empty_trip(trips, loads, target, weights, limit, deadline):
+    """
+    Tries to empty trips[target] by moving its cows, heaviest first, to the
+    other trip with the least room that still fits them, and when none fits
+    by swapping one of them for a lighter cow of another trip, picking the
+    swap that leaves that trip fullest. Every step takes weight off the
+    target, so it ends when the target is empty, no step is left or the
+    deadline passes. Updates trips and loads in place.
+    Returns True if the target was emptied.
+    """
+    trip = trips[target]
+    while trip != []:
+        if time.perf_counter() > deadline:
+            return False
+        trip.sort(key=weights.__getitem__, reverse=True)
+        move = None
+        for x in trip:
+            for t in range(len(trips)):
+                if (t != target and loads[t] + weights[x] <= limit
+                        and (move is None or loads[t] > loads[move[1]])):
+                    move = (x, t)
+            if move is not None:
+                break
+        if move is not None:
+            x, t = move
+            trip.remove(x)
+            trips[t].append(x)
+            loads[target] -= weights[x]
+            loads[t] += weights[x]
+            continue
+
+        swap = None
+        for x in trip:
+            for t in range(len(trips)):
+                if t == target:
+                    continue
+                for y in trips[t]:
+                    load = loads[t] - weights[y] + weights[x]
+                    if (weights[y] < weights[x] and load <= limit
+                            and (swap is None or load > swap[3])):
+                        swap = (x, t, y, load)
+        if swap is None:
+            return False
+        x, t, y, load = swap
+        trip.remove(x)
+        trip.append(y)
+        trips[t].remove(y)
+        trips[t].append(x)
+        loads[target] -= weights[x] - weights[y]
+        loads[t] = load
+    return True
+
+
+def local_search_cow_transport(cows, limit=10, budget=0.1, seed=None):
+    """
+    Improves the allocation of greedy_cow_transport for as long as the time
+    budget allows, so that it can be traded for fewer trips where an exact
+    search would take too long.
+    Repeatedly picks one of the lightest trips and tries to empty it by
+    moving its cows to other trips, or swapping them for lighter cows of
+    other trips, see _empty_trip. Every trip emptied is one trip less; when
+    a trip cannot be emptied the search goes on from the cows as they were
+    moved, with another of the lightest trips. Stops when the budget runs
+    out or the allocation meets the lower bound of ps1_bounds.
+    Does not mutate the given cows.
+    Parameters:
+    cows - a dictionary of name (string), weight (int) pairs, or a Herd
+    limit - weight limit of the spaceship (an int)
+    budget - the time to spend improving the allocation, in seconds
+    seed - seed of the choice of trips to empty, for repeatable runs
+    Returns:
+    The best allocation found, a list of lists, with each inner list
+    containing the names of cows transported on a particular trip and the
+    overall list containing all the trips
+    Raises ValueError if some cow is heavier than the limit.
+    """
+    deadline = time.perf_counter() + budget
+    best = greedy_cow_transport(cows, limit)
+    if best.gap <= 0:
+        return best
+    names, weights = _cow_lists(cows)
+    index = {name: i for i, name in enumerate(names)}
+    trips = [[index[name] for name in trip] for trip in best]
+    loads = [sum(weights[i] for i in trip) for trip in trips]
+    rng = random.Random(seed)
+
+    while len(trips) > best.lower_bound and time.perf_counter() < deadline:
+        lightest = sorted(range(len(trips)), key=loads.__getitem__)
+        target = lightest[rng.randrange(min(3, len(trips)))]
+        if _empty_trip(trips, loads, target, weights, limit, deadline):
+            del trips[target]
+            del loads[target]
+            best = Allocation([[names[i] for i in trip] for trip in trips],
+                              best.lower_bound)
+    return best
+
+
+# Problem 2
+def brute_force_cow_transport(cows,limit=10):
+    """
+    Finds the allocation of cows that minimizes the number of spaceship trips
+    via brute force.  The brute force algorithm should follow the following method:
+    1. Enumerate all possible ways that the cows can be divided into separate trips
+    2. Select the allocation that minimizes the number of trips without making any trip
+        that does not obey the weight limitation
+    Ways of dividing the cows are abandoned as soon as one trip goes over the
+    weight limit, so only the feasible allocations are enumerated, and the
+    enumeration stops at the first allocation that meets the lower bound of
+    ps1_bounds, since none can beat it.
+    Does not mutate the given cows.
+    Parameters:
+    cows - a dictionary of name (string), weight (int) pairs, or a Herd
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    A list of lists, with each inner list containing the names of cows
+    transported on a particular trip and the overall list containing all the
+    trips
+    """
+    names, weights = _cow_lists(cows)
+
+    def underLimit(trip):
+        return sum(weights[i] for i in trip) <= limit
+
+    # only transport schemes where every load obeys the limit are visited
+    bound = lower_bound(weights, limit)
+    finalResult = []
+    for transport in feasible_partitions(range(len(names)), underLimit):
+        # keep a copy of the scheme with min number of loads
+        if finalResult == [] or len(transport) < len(finalResult):
+            finalResult = [[names[i] for i in load] for load in transport]
+            if len(finalResult) <= bound:
+                # no scheme has fewer loads than the lower bound
+                break
+    return Allocation(finalResult, bound)
+
+
+class _TripSearch(object):
+    """
+    Depth-first branch-and-bound search that fills one trip at a time.
+    Every trip is started with the heaviest cow left and completed with a set
+    of the remaining cows that leaves no room for any other cow left and in
+    which no cow could be swapped for a heavier one left, trying the fullest
+    completions first. Cows of the same weight are only counted,
+    never told apart, so no two branches lead to the same loads. A branch is
+    cut as soon as its trips plus a lower bound on the trips still needed
+    cannot beat the best allocation known.
+    A trip is held as a pattern, a list of (j, c) pairs meaning c cows of
+    weight distinct[j], and an allocation as a list of runs, (pattern, times)
+    pairs of a pattern repeated times in a row. Every trip found is taken as
+    many times as there are cows left for it first, and two runs in a row
+    never have the same pattern, so the search goes as deep as the number
+    of runs rather than of trips. It only sees the number of cows of every
+    weight, so cows of the same weight never multiply the branches.
+    Since the order of the trips does not matter, the numbers of cows left
+    reached so far are remembered with the fewest trips they were reached
+    with, and a branch reaching them again with no fewer trips is cut.
+    """
+    def __init__(self, distinct, counts, limit, best_count, shared=None):
+        """
+        distinct - the distinct cow weights (ints) in decreasing order
+        counts - the number of cows of every weight
+        limit - weight limit of the spaceship (an int)
+        best_count - number of trips of the best allocation known so far
+        shared - a multiprocessing.Value holding the best trip count known
+            to any process searching the same herd, or None
+        """
+        self.distinct = list(distinct)
+        self.counts = list(counts)
+        self.limit = limit
+        self.best_count = best_count
+        self.shared = shared
+        # no allocation needs fewer trips, so the search stops once it finds
+        # one with this many
+        self.lowerBound = lower_bound(distinct, limit, counts)
+        self.trips = []
+        self.tripCount = 0
+        self.seen = {}
+        self.found = None
+        self.split_depth = None
+        self.prefixes = []
+
+    def complete(self, j, room, pattern, total):
+        """
+        Adds cows of weight distinct[j] or lighter to the current trip, or
+        closes it. Returns True once the search can stop.
+        """
+        distinct, counts = self.distinct, self.counts
+        k = len(distinct)
+        for m in range(j, k):
+            most = min(counts[m], room // distinct[m])
+            for c in range(most, 0, -1):
+                counts[m] -= c
+                pattern.append((m, c))
+                finished = self.complete(m + 1, room - c * distinct[m],
+                                         pattern, total - c * distinct[m])
+                pattern.pop()
+                counts[m] += c
+                if finished:
+                    return True
+
+        for m in range(k - 1, -1, -1):
+            if counts[m] > 0:
+                if distinct[m] <= room:
+                    # another cow still fits, not a maximal trip
+                    return False
+                break
+        for m, c in pattern:
+            for bigger in range(m - 1, -1, -1):
+                if counts[bigger] > 0:
+                    if distinct[bigger] <= distinct[m] + room:
+                        # swapping in a heavier cow left gives a trip that is
+                        # at least as good
+                        return False
+                    break
+        if self.trips != [] and self.trips[-1][0] == pattern:
+            # the same trip again belongs to the run before
+            return False
+
+        tripWeight = self.limit - room
+        most = min(counts[m] // c for m, c in pattern) + 1
+        for times in range(most, 0, -1):
+            for m, c in pattern:
+                counts[m] -= c * (times - 1)
+            self.trips.append((list(pattern), times))
+            self.tripCount += times
+            finished = self.fill(total - (times - 1) * tripWeight)
+            self.tripCount -= times
+            self.trips.pop()
+            for m, c in pattern:
+                counts[m] += c * (times - 1)
+            if finished:
+                return True
+        return False
+
+    def fill(self, total):
+        """
+        Starts the next trip, given the total weight of the cows left.
+        Returns True once the search can stop.
+        """
+        tripCount = self.tripCount
+        bestCount = self.best_count
+        if self.shared is not None:
+            bestCount = min(bestCount, self.shared.value)
+        if total == 0:
+            if tripCount < bestCount:
+                self.best_count = tripCount
+                self.found = list(self.trips)
+                if self.shared is not None:
+                    with self.shared.get_lock():
+                        if self.best_count < self.shared.value:
+                            self.shared.value = self.best_count
+            # nothing can beat the lower bound, stop the whole search
+            return tripCount <= self.lowerBound
+        if tripCount + lower_bound_l2_histogram(self.distinct, self.limit,
+                                                self.counts) >= bestCount:
+            return False
+        state = tuple(self.counts)
+        if self.seen.get(state, bestCount) <= tripCount:
+            # the same cows were left before with no more trips
+            return False
+        self.seen[state] = tripCount
+        if len(self.trips) == self.split_depth:
+            self.prefixes.append(list(self.trips))
+            return False
+        j = 0
+        while self.counts[j] == 0:
+            j += 1
+        # the trip takes some of the heaviest cows left, and lighter ones
+        # are added by complete from the next weight on
+        weight = self.distinct[j]
+        for c in range(min(self.counts[j], self.limit // weight), 0, -1):
+            self.counts[j] -= c
+            finished = self.complete(j + 1, self.limit - c * weight, [(j, c)],
+                                     total - c * weight)
+            self.counts[j] += c
+            if finished:
+                return True
+        return False
+
+    def solve(self, prefix=()):
+        """
+        Searches the allocations that start with the runs in prefix.
+        Returns the runs of an allocation using fewer trips than the best
+        known, or None if there is none.
+        """
+        total = sum(c * w for c, w in zip(self.counts, self.distinct))
+        for pattern, times in prefix:
+            for j, c in pattern:
+                self.counts[j] -= c * times
+                total -= c * times * self.distinct[j]
+        self.trips = list(prefix)
+        self.tripCount = sum(times for pattern, times in prefix)
+        self.seen = {}
+        self.fill(total)
+        self.trips = []
+        self.tripCount = 0
+        self.seen = {}
+        for pattern, times in prefix:
+            for j, c in pattern:
+                self.counts[j] += c * times
+        return self.found
+
+    def split(self, depth):
+        """
+        Returns the first depth runs of every branch that survives to that
+        depth, as lists of runs, to be searched with solve. Allocations
+        with fewer runs are searched right away.
+        """
+        self.split_depth = depth
+        self.prefixes = []
+        self.solve()
+        self.split_depth = None
+        return self.prefixes
+
+
+# Problem 2b
+def branch_and_bound_cow_transport(cows, limit=10):
+    """
+    Finds the allocation of cows that minimizes the number of spaceship trips
+    using branch-and-bound, so that herds far too big for
+    brute_force_cow_transport can still be solved exactly.
+    Trips are filled one at a time, each starting with the largest cow left,
+    beginning from the greedy allocation as the best one known, and every
+    branch that cannot use fewer trips than the best allocation found so far
+    is pruned. The search stops as soon as an allocation meets the lower
+    bound of ps1_bounds, and is not started at all if the greedy one does.
+    Does not mutate the given cows.
+    Parameters:
+    cows - a dictionary of name (string), weight (int) pairs, or a Herd
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    A list of lists, with each inner list containing the names of cows
+    transported on a particular trip and the overall list containing all the
+    trips. An empty list if some cow is heavier than the limit.
+    """
+    distinct, counts, names = _histogram(cows)
+    if distinct == [] or distinct[0] > limit:
+        return Allocation([], lower_bound(distinct, limit, counts))
+    runs = _pattern_fit(distinct, counts, limit)
+    search = _TripSearch(distinct, counts, limit,
+                         sum(times for pattern, times in runs))
+    if search.best_count > search.lowerBound:
+        found = search.solve()
+        if found is not None:
+            runs = found
+    return Allocation(_expand(runs, names), search.lowerBound)
+
+
+# the best trip count shared by the processes of parallel_cow_transport
+_sharedBest = None
+
+
+def _share_best(shared):
+    global _sharedBest
+    _sharedBest = shared
+
+
+def _search_branch(distinct, counts, limit, prefix):
+    """
+    Searches one branch of the allocations of parallel_cow_transport in a
+    worker process, pruning against the best trip count found by any of them.
+    Returns the runs of a better allocation, or None.
+    """
+    search = _TripSearch(distinct, counts, limit, _sharedBest.value,
+                         _sharedBest)
+    return search.solve(prefix)
+
+
+def parallel_cow_transport(cows, limit=10, workers=None):
+    """
+    Finds the allocation of cows that minimizes the number of spaceship trips
+    using the same branch-and-bound search as branch_and_bound_cow_transport,
+    spread over a pool of processes.
+    The search is split by the first trips of every branch into more
+    branches than there are workers, and the workers share the best trip
+    count found so far, so each of them prunes with the others' allocations
+    too. Returns an allocation with the same number of trips as
+    branch_and_bound_cow_transport, and like it no process is started when
+    the greedy allocation already meets the lower bound.
+    Does not mutate the given cows.
+    Parameters:
+    cows - a dictionary of name (string), weight (int) pairs, or a Herd
+    limit - weight limit of the spaceship (an int)
+    workers - number of processes to use, by default the number of CPUs
+    Returns:
+    A list of lists, with each inner list containing the names of cows
+    transported on a particular trip and the overall list containing all the
+    trips. An empty list if some cow is heavier than the limit.
+    """
+    distinct, counts, names = _histogram(cows)
+    if distinct == [] or distinct[0] > limit:
+        return Allocation([], lower_bound(distinct, limit, counts))
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    runs = _pattern_fit(distinct, counts, limit)
+    search = _TripSearch(distinct, counts, limit,
+                         sum(times for pattern, times in runs))
+    if search.best_count == search.lowerBound:
+        return Allocation(_expand(runs, names), search.lowerBound)
+
+    # go one run deeper until there are enough branches to keep every
+    # worker busy until the end
+    depth = 1
+    prefixes = search.split(depth)
+    while (0 < len(prefixes) < 4 * workers and depth < search.best_count
+           and search.best_count > search.lowerBound):
+        depth += 1
+        prefixes = search.split(depth)
+
+    def trip_count(runs):
+        return sum(times for pattern, times in runs)
+
+    best = search.found
+    if prefixes != [] and search.best_count > search.lowerBound:
+        shared = multiprocessing.Value('i', search.best_count)
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_share_best, initargs=(shared,)) as pool:
+            futures = [pool.submit(_search_branch, distinct, counts, limit,
+                                   prefix) for prefix in prefixes]
+            for future in concurrent.futures.as_completed(futures):
+                found = future.result()
+                if found is not None and (best is None or trip_count(found)
+                                          < trip_count(best)):
+                    best = found
+    if best is not None:
+        runs = best
+    return Allocation(_expand(runs, names), search.lowerBound)
+
+
+# Problem 2c
+def dynamic_cow_transport(cows, limit=10):
+    """
+    Finds the allocation of cows that minimizes the number of spaceship trips
+    by dynamic programming over all subsets of the herd, each held as a
+    bitmask with bit i set when the i-th cow is in the subset.
+    For every subset it keeps the fewest trips that carry exactly those cows
+    and, among those, the lightest load on the last trip. A subset is reached
+    from the subsets with one cow less by putting that cow on the last trip
+    if it fits or on a new trip otherwise. The total weight of every subset
+    is computed first in one pass over the bits, which settles all subsets
+    light enough for a single trip at once. Runs in time and memory of the
+    order of 2**n for n cows, so it is meant for herds of up to about 25 cows,
+    unless the greedy allocation already meets the lower bound of ps1_bounds
+    and is returned right away.
+    Does not mutate the given cows.
+    Parameters:
+    cows - a dictionary of name (string), weight (int) pairs, or a Herd
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    A list of lists, with each inner list containing the names of cows
+    transported on a particular trip and the overall list containing all the
+    trips. An empty list if some cow is heavier than the limit.
+    """
+    names, weights = _cow_lists(cows)
+    n = len(names)
+    if n == 0 or max(weights) > limit:
+        return Allocation([], lower_bound(weights, limit))
+    greedyResult = greedy_cow_transport(cows, limit)
+    if greedyResult.optimal:
+        # no subsets to go through, the greedy allocation cannot be beaten
+        return greedyResult
+
+    size = 1 << n
+    # the weight and the number of cows of every subset
+    weightType = np.int32 if sum(weights) < 2**31 else np.int64
+    subsetWeight = np.zeros(size, dtype=weightType)
+    subsetCount = np.zeros(size, dtype=np.uint8)
+    for i in range(n):
+        low = 1 << i
+        subsetWeight[low:2 * low] = subsetWeight[:low] + weights[i]
+        subsetCount[low:2 * low] = subsetCount[:low] + 1
+
+    # (trips, load of the last trip) packed into one number as
+    # trips * (limit + 1) + load, so that the smallest number is the best
+    step = limit + 1
+    keyType = np.int32 if (n + 1) * step < 2**31 else np.int64
+    best = np.full(size, (n + 1) * step, dtype=keyType)
+    oneTrip = subsetWeight <= limit
+    best[oneTrip] = step + subsetWeight[oneTrip]
+
+    for k in range(2, n + 1):
+        layer = np.flatnonzero((subsetCount == k) & ~oneTrip)
+        if len(layer) == 0:
+            continue
+        for i in range(n):
+            masks = layer[(layer >> i) & 1 == 1]
+            before = best[masks ^ (1 << i)]
+            load = before % step
+            candidate = np.where(load + weights[i] <= limit,
+                                 before + weights[i],
+                                 before - load + step + weights[i])
+            best[masks] = np.minimum(best[masks], candidate)
+
+    # walk back from the whole herd, taking off one cow at a time
+    finalResult = []
+    trip = []
+    mask = size - 1
+    while mask != 0:
+        key = int(best[mask])
+        for i in range(n):
+            if mask & (1 << i):
+                before = int(best[mask ^ (1 << i)])
+                load = before % step
+                if load + weights[i] <= limit:
+                    if before + weights[i] == key:
+                        trip.append(names[i])
+                        break
+                elif before - load + step + weights[i] == key:
+                    # cow i started the last trip
+                    trip.append(names[i])
+                    finalResult.append(trip[::-1])
+                    trip = []
+                    break
+        mask ^= 1 << i
+    if trip != []:
+        finalResult.append(trip[::-1])
+    return Allocation(finalResult[::-1], greedyResult.lower_bound)
+
+
+def _solve_herd(job):
+    """
+    Solves one herd of batch_cow_transport in a worker process. job is a
+    tuple (cows, limit, exact_size).
+    """
+    cows, limit, exact_size = job
+    if len(cows) <= exact_size:
+        return branch_and_bound_cow_transport(cows, limit)
+    try:
+        return greedy_cow_transport(cows, limit)
+    except ValueError:
+        # a cow heavier than the limit, which branch_and_bound_cow_transport
+        # answers with no trips; one such herd must not stop the others
+        return Allocation([], lower_bound(_cow_lists(cows)[1], limit))
+
+
+def batch_cow_transport(herds, exact_size=30, workers=None, chunksize=None):
+    """
+    Finds allocations for many independent herds, each with its own weight
+    limit, over a pool of processes. Herds of up to exact_size cows are solved
+    exactly with branch_and_bound_cow_transport and larger ones with
+    greedy_cow_transport. The herds are handed to the workers in chunks of
+    chunksize, so that sending them back and forth costs little next to
+    solving them.
+    Does not mutate the given cows.
+    Parameters:
+    herds - an iterable of (cows, limit) pairs, where cows is a dictionary of
+        name (string), weight (int) pairs or a Herd and limit an int
+    exact_size - the largest herd solved exactly (an int)
+    workers - number of processes to use, by default the number of CPUs; with
+        1 the herds are solved in this process
+    chunksize - number of herds sent to a worker at once, by default enough
+        for about four chunks per worker
+    Returns:
+    A list with the allocation of every herd, in the order of herds, each
+    like the result of greedy_cow_transport, or an empty allocation for a
+    herd with some cow heavier than its limit, however it is solved
+    """
+    jobs = [(cows, limit, exact_size) for cows, limit in herds]
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers == 1 or len(jobs) <= 1:
+        return [_solve_herd(job) for job in jobs]
+    if chunksize is None:
+        chunksize = max(1, -(-len(jobs) // (4 * workers)))
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(_solve_herd, jobs, chunksize=chunksize))
+
+
+# Problem 3
+def compare_cow_transport_algorithms(cows=None, limit=10):
+    """
+    Using the data from ps1_cow_data.txt and the specified weight limit, run your
+    greedy_cow_transport, local_search_cow_transport,
+    brute_force_cow_transport, branch_and_bound_cow_transport,
+    parallel_cow_transport and dynamic_cow_transport functions here.
+    Use the default weight limits of 10 for all of them.
+    Print out the number of trips returned by each method, and how long each
+    method takes to run in seconds.
+    For timings over many herds and sizes use the suite in ps1_benchmark.
+    Parameters:
+    cows - a dictionary of name (string), weight (int) pairs, or a Herd, by
+        default the cows of ps1_cow_data.txt
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    Does not return anything.
+    """
+    if cows is None:
+        cows = load_cows(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      'ps1_cow_data.txt'))
+    algorithms = [greedy_cow_transport, local_search_cow_transport,
+                  brute_force_cow_transport,
+                  branch_and_bound_cow_transport, parallel_cow_transport,
+                  dynamic_cow_transport]
+
+    for algorithm in algorithms:
+        print('The ' + algorithm.__name__ + ' takes ' + str(len(algorithm(cows,limit=limit))) + ' transports')
+    print()
+    for algorithm in algorithms:
+        start = time.perf_counter()
+        algorithm(cows, limit=limit)
+        end = time.perf_counter()
+        print('The ' + algorithm.__name__ + ' takes ' + str(end - start) + ' seconds')
+
+
+"""
+Here is some test data for you to see the results of your algorithms with. 
+Do not submit this along with any of your answers. Uncomment the last two
+lines to print the result of your problem.
+"""
+
+if __name__ == '__main__':
+    cows = load_cows("ps1_cow_data.txt")
+    limit = 100
+    #print(cows)
+
+    print(greedy_cow_transport(cows))
+    print()
+    print(brute_force_cow_transport(cows))
+    print()
+    compare_cow_transport_algorithms(cows)
+
+
+#TESTING
+#greedy_cow_transport({'Polaris': 20, 'Louis': 45, 'Clover': 5, 'Patches': 60, 'Lotus': 10, 'Milkshake': 75, 'Horns': 50, 'Muscles': 65, 'Miss Bella': 15, 'MooMoo': 85}, 100)
+#[['MooMoo', 'Miss Bella'], ['Milkshake', 'Polaris', 'Clover'], ['Muscles', 'Lotus'], ['Patches'], ['Horns', 'Louis']]
+
+#greedy_cow_transport({'Buttercup': 72, 'Coco': 10, 'Willow': 35, 'Daisy': 50, 'Dottie': 85, 'Rose': 50, 'Lilly': 24, 'Patches': 12, 'Abby': 38, 'Betsy': 65}, 100)
+#[['Dottie', 'Patches'], ['Buttercup', 'Lilly'], ['Betsy', 'Willow'], ['Daisy', 'Rose'], ['Abby', 'Coco']]
+
+#greedy_cow_transport({'Buttercup': 11, 'Starlight': 54, 'Willow': 59, 'Luna': 41, 'Rose': 42, 'Abby': 28, 'Betsy': 39, 'Coco': 59}, 120)
+#[['Coco', 'Willow'], ['Starlight', 'Rose', 'Buttercup'], ['Luna', 'Betsy', 'Abby']]
+
+#brute_force_cow_transport({'Lotus': 40, 'Horns': 25, 'Milkshake': 40, 'Boo': 20, 'Miss Bella': 25, 'MooMoo': 50}, 100)
+#[['MooMoo', 'Horns', 'Miss Bella'], ['Lotus', 'Milkshake', 'Boo']]
+
+#brute_force_cow_transport({'Daisy': 50, 'Buttercup': 72, 'Betsy': 65}, 75)
+#[['Buttercup'], ['Daisy'], ['Betsy']]
+
+#brute_force_cow_transport({'Starlight': 54, 'Buttercup': 11, 'Luna': 41, 'Betsy': 39}, 145)
+#[['Betsy', 'Buttercup', 'Starlight', 'Luna']]
+
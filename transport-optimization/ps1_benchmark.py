@@ -0,0 +1,283 @@
+###########################
+# 6.00.2x Problem Set 1: Space Cows
+# Benchmark suite for the cow transport algorithms
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import ps1
+import ps1_bounds
+from ps1_online import online_cow_transport
+
+
+#================================
+# Synthetic herds
+#================================
+
+def uniform_herd(n, limit, seed=0):
+    """
+    Returns a dictionary of n cows whose weights are drawn uniformly between
+    1 and limit.
+    """
+    rng = random.Random(seed)
+    return {'Cow %d' % i: rng.randint(1, limit) for i in range(n)}
+
+
+def bimodal_herd(n, limit, seed=0):
+    """
+    Returns a dictionary of n cows, half of them light (up to a third of the
+    limit) and half of them heavy (above half the limit), in random order.
+    """
+    rng = random.Random(seed)
+    cows = {}
+    for i in range(n):
+        if rng.random() < 0.5:
+            cows['Cow %d' % i] = rng.randint(1, max(1, limit // 3))
+        else:
+            cows['Cow %d' % i] = rng.randint(limit // 2 + 1, limit)
+    return cows
+
+
+def near_limit_herd(n, limit, seed=0):
+    """
+    Returns a dictionary of n cows made of pairs: a cow heavier than half the
+    limit and a lighter one that fills the rest of the trip, so that the
+    best allocation takes one trip per pair and every trip is close to the
+    limit. Needs limit >= 3.
+    """
+    rng = random.Random(seed)
+    cows = {}
+    for i in range(0, n, 2):
+        heavy = rng.randint(limit // 2 + 1, limit - 1)
+        cows['Cow %d' % i] = heavy
+        if i + 1 < n:
+            cows['Cow %d' % (i + 1)] = rng.randint(1, limit - heavy)
+    return cows
+
+
+HERDS = {
+    'uniform': uniform_herd,
+    'bimodal': bimodal_herd,
+    'near_limit': near_limit_herd,
+}
+
+
+#================================
+# Solvers
+#================================
+
+def _online_first_fit(cows, limit):
+    return list(online_cow_transport(cows, limit, 'first_fit'))
+
+
+def _greedy_method(method):
+    def solver(cows, limit):
+        return ps1.greedy_cow_transport(cows, limit, method)
+    return solver
+
+
+# name, solver and the largest herd it is run on (None for no limit)
+SOLVERS = [
+    ('greedy', _greedy_method('largest'), None),
+    ('first_fit_decreasing', _greedy_method('first_fit'), None),
+    ('best_fit_decreasing', _greedy_method('best_fit'), None),
+    ('online_first_fit', _online_first_fit, None),
+    ('local_search', ps1.local_search_cow_transport, None),
+    ('brute_force', ps1.brute_force_cow_transport, 10),
+    ('dynamic', ps1.dynamic_cow_transport, 20),
+    ('branch_and_bound', ps1.branch_and_bound_cow_transport, 60),
+    ('parallel', ps1.parallel_cow_transport, 60),
+]
+
+
+def lower_bound(cows, limit):
+    """
+    Returns a lower bound on the number of trips needed for cows, the
+    Martello-Toth L2 bound of ps1_bounds.
+    """
+    return ps1_bounds.lower_bound(list(cows.values()), limit)
+
+
+def time_solver(solver, cows, limit, repeat=5):
+    """
+    Runs solver(cows, limit) repeat times, timing each run with
+    time.perf_counter, and once more under tracemalloc to measure the peak
+    memory it allocates.
+    Returns:
+    A tuple (allocation, list of run times in seconds, peak memory in bytes)
+    """
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = solver(cows, limit)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        solver(cows, limit)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, times, peak
+
+
+def run_benchmark(sizes, herds=None, solvers=None, limit=100, repeat=5,
+                  seed=0, report=None):
+    """
+    Times every solver on a herd of every kind and size, skipping herds
+    larger than a solver is meant for. The herds are generated from seed, so
+    every run of the suite measures the same instances.
+    Parameters:
+    sizes - a list of herd sizes (ints)
+    herds - names of the herds in HERDS to use, by default all of them
+    solvers - names of the solvers in SOLVERS to use, by default all of them
+    limit - weight limit of the spaceship (an int)
+    repeat - number of timed runs of each solver on each herd
+    seed - seed of the herd generators
+    report - called with every result as soon as it is measured, or None
+    Returns:
+    A list of dictionaries, one result for each herd and solver
+    """
+    if herds is None:
+        herds = list(HERDS)
+    results = []
+    for herd in herds:
+        for size in sizes:
+            cows = HERDS[herd](size, limit, seed)
+            bound = lower_bound(cows, limit)
+            for name, solver, largest in SOLVERS:
+                if solvers is not None and name not in solvers:
+                    continue
+                if largest is not None and size > largest:
+                    continue
+                allocation, times, peak = time_solver(solver, cows, limit,
+                                                      repeat)
+                result = {
+                    'herd': herd,
+                    'size': size,
+                    'limit': limit,
+                    'seed': seed,
+                    'solver': name,
+                    'trips': len(allocation),
+                    'lower_bound': bound,
+                    'gap': len(allocation) - bound,
+                    'repeat': repeat,
+                    'best_seconds': min(times),
+                    'median_seconds': statistics.median(times),
+                    'peak_bytes': peak,
+                }
+                results.append(result)
+                if report is not None:
+                    report(result)
+    return results
+
+
+#================================
+# Cross-check
+#================================
+
+def check_allocation(cows, limit, allocation):
+    """
+    Returns a description of what is wrong with an allocation of cows, or
+    None if every cow is on exactly one trip and no trip is over the limit.
+    """
+    names = [name for trip in allocation for name in trip]
+    if sorted(names) != sorted(cows):
+        missing = set(cows) - set(names)
+        return 'cows missing %s or carried twice' % sorted(missing)
+    for trip in allocation:
+        if trip == []:
+            return 'an empty trip'
+        if sum(cows[name] for name in trip) > limit:
+            return 'trip %s over the limit' % trip
+    return None
+
+
+def check_solvers(trials, solvers=None, seed=0):
+    """
+    Runs the exact solvers on trials random herds of up to 16 cows, with
+    few distinct weights so that many cows weigh the same, and compares
+    them with dynamic_cow_transport.
+    Parameters:
+    trials - the number of herds
+    solvers - names of the solvers in SOLVERS to check, by default the
+        exact ones
+    seed - seed of the herds
+    Returns:
+    A list of (herd, limit, solver name, problem) for every wrong result
+    """
+    if solvers is None:
+        solvers = ['brute_force', 'branch_and_bound', 'parallel']
+    rng = random.Random(seed)
+    failures = []
+    for trial in range(trials):
+        limit = rng.randint(2, 20)
+        weights = [rng.randint(1, limit) for i in range(rng.randint(1, 4))]
+        size = rng.randint(1, 10 if 'brute_force' in solvers else 16)
+        cows = {'c%d' % i: rng.choice(weights) for i in range(size)}
+        expected = len(ps1.dynamic_cow_transport(cows, limit))
+        for name, solver, largest in SOLVERS:
+            if name not in solvers or (largest is not None and size > largest):
+                continue
+            allocation = solver(cows, limit)
+            problem = check_allocation(cows, limit, allocation)
+            if problem is None and len(allocation) != expected:
+                problem = '%d trips instead of %d' % (len(allocation), expected)
+            if problem is not None:
+                failures.append((cows, limit, name, problem))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the cow transport algorithms.')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1000, 10**4, 10**5, 10**6])
+    parser.add_argument('--herds', nargs='+', choices=sorted(HERDS))
+    parser.add_argument('--solvers', nargs='+',
+                        choices=[name for name, solver, largest in SOLVERS])
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to write the JSON results to')
+    parser.add_argument('--check', type=int, metavar='TRIALS',
+                        help='instead of timing, check the exact solvers '
+                        'against dynamic_cow_transport on TRIALS random herds')
+    args = parser.parse_args(argv)
+
+    if args.check is not None:
+        failures = check_solvers(args.check, args.solvers, args.seed)
+        for cows, limit, name, problem in failures:
+            print('%s, limit %d: %s: %s' % (cows, limit, name, problem))
+        print('%d wrong results in %d herds' % (len(failures), args.check))
+        sys.exit(1 if failures else 0)
+
+    def report(result):
+        print('%-10s %8d  %-22s %8d trips  gap %-5d %10.6f s %12d bytes' %
+              (result['herd'], result['size'], result['solver'],
+               result['trips'], result['gap'], result['best_seconds'],
+               result['peak_bytes']), file=sys.stderr)
+
+    results = run_benchmark(args.sizes, args.herds, args.solvers, args.limit,
+                            args.repeat, args.seed, report)
+    document = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output is None:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+###########################
+# 6.00.2x Problem Set 1: Space Cows
+# Lower bounds on the number of trips and how far an allocation is from them
+
+import numpy as np
+
+
+def lower_bound_l1(weights, limit, counts=None):
+    """
+    The total weight of the cows divided by the limit, rounded up. This is
+    also the bound given by the LP relaxation of the usual formulation of
+    the problem, where a cow may be split across trips.
+    Parameters:
+    weights - the cow weights (ints), in any order
+    limit - weight limit of the spaceship (an int)
+    counts - the number of cows of every weight in weights, or None for one
+    Returns:
+    an int
+    """
+    if counts is None:
+        total = np.sum(weights, dtype=np.int64)
+    else:
+        total = np.dot(np.asarray(weights, dtype=np.int64),
+                       np.asarray(counts, dtype=np.int64))
+    return -(-int(total) // limit)
+
+
+def lower_bound_l2_histogram(distinct, limit, counts):
+    """
+    The Martello-Toth L2 bound. For a weight a of at most half the limit,
+    the cows heavier than limit - a can share a trip with no cow of weight a
+    or more, the cows heavier than half the limit never share a trip with
+    each other, and the cows from a up to half the limit need trips for
+    whatever of their weight does not fit next to the cows heavier than
+    half the limit. The bound is the largest count over all such a, found
+    in one pass over the weights from the lightest a up, so in O(k) time
+    for k distinct weights.
+    Parameters:
+    distinct - the distinct cow weights (ints) from the heaviest to the
+        lightest
+    limit - weight limit of the spaceship (an int)
+    counts - the number of cows of every weight in distinct, which may be 0
+    Returns:
+    an int, at least lower_bound_l1(distinct, limit, counts)
+    """
+    k = len(distinct)
+    # the cows heavier than half the limit come first
+    half = 0
+    bigCount = 0
+    bigWeight = 0
+    while half < k and 2 * distinct[half] > limit:
+        bigCount += counts[half]
+        bigWeight += counts[half] * distinct[half]
+        half += 1
+    smallWeight = 0
+    for j in range(half, k):
+        smallWeight += counts[j] * distinct[j]
+    best = -(-(bigWeight + smallWeight) // limit)
+
+    # the cows heavier than limit - a and the cows from a up to half the
+    # limit, both only ever growing or shrinking as a grows
+    heavy = 0
+    heavyCount = 0
+    heavyWeight = 0
+    small = k
+    for j in range(k, half - 1, -1):
+        if j == k:
+            a = 0
+        elif counts[j] > 0:
+            a = distinct[j]
+        else:
+            continue
+        while heavy < half and distinct[heavy] > limit - a:
+            heavyCount += counts[heavy]
+            heavyWeight += counts[heavy] * distinct[heavy]
+            heavy += 1
+        while small > half and distinct[small - 1] < a:
+            small -= 1
+            smallWeight -= counts[small] * distinct[small]
+        middleCount = bigCount - heavyCount
+        spill = smallWeight - (middleCount * limit - (bigWeight - heavyWeight))
+        best = max(best, bigCount + max(0, -(-spill // limit)))
+    return best
+
+
+def lower_bound_l2(weights, limit, counts=None):
+    """
+    The Martello-Toth L2 bound of lower_bound_l2_histogram, for cows of the
+    given weights, in O(n log n) time, or O(k log k) for k distinct weights
+    given with their counts.
+    Parameters:
+    weights - the cow weights (ints), in any order
+    limit - weight limit of the spaceship (an int)
+    counts - the number of cows of every weight in weights, or None for one
+    Returns:
+    an int, at least lower_bound_l1(weights, limit, counts)
+    """
+    w = np.asarray(weights, dtype=np.int64)
+    if len(w) == 0:
+        return 0
+    if counts is None:
+        w = np.sort(w)[::-1]
+        c = np.ones(len(w), dtype=np.int64)
+    else:
+        order = np.argsort(-w, kind='stable')
+        w = w[order]
+        c = np.asarray(counts, dtype=np.int64)[order]
+    starts = np.flatnonzero(np.diff(w, prepend=w[0] + 1))
+    return lower_bound_l2_histogram(w[starts].tolist(), limit,
+                                    np.add.reduceat(c, starts).tolist())
+
+
+def lower_bound(weights, limit, counts=None):
+    """
+    The best of the lower bounds of this module on the number of trips
+    needed for cows of the given weights, each counts times if given.
+    """
+    return lower_bound_l2(weights, limit, counts)
+
+
+class Allocation(list):
+    """
+    A list of trips, each a list of cow names, as returned by the transport
+    solvers, that also knows a lower bound on the number of trips needed for
+    the same cows and so how far it is at most from the best allocation.
+    """
+    def __init__(self, trips, lower_bound):
+        """
+        trips - a list of lists of cow names
+        lower_bound - a lower bound on the number of trips (an int)
+        """
+        list.__init__(self, trips)
+        self.lower_bound = lower_bound
+
+    @property
+    def gap(self):
+        """The number of trips above the lower bound."""
+        return len(self) - self.lower_bound
+
+    @property
+    def optimal(self):
+        """True if the allocation is proven to use the fewest trips."""
+        return self.gap == 0
+
+
+#TESTING
+#print(lower_bound_l1([9, 9, 7, 6, 5, 3, 3, 2, 2, 2], 10))
+#5
+#print(lower_bound_l2([99, 97, 94, 93, 8, 5, 4, 2], 100))
+#5
@@ -0,0 +1,113 @@
+###########################
+# 6.00.2x Problem Set 1: Space Cows
+# Cache of the allocations found for herds of the same weights
+
+import collections
+import shelve
+
+from ps1 import brute_force_cow_transport
+from ps1_bounds import Allocation, lower_bound
+
+
+class SolutionCache(object):
+    """
+    Remembers the allocations a transport solver finds, keyed by the sorted
+    weights of the herd and the limit, so that a herd with the same weights
+    as one solved before, whatever the names of its cows, is answered
+    without running the solver again. An allocation is kept as the weights
+    carried on every trip and is given back the cows' names on every hit.
+    The most recently used allocations are kept in memory, and optionally
+    all of them in a shelve file that outlives the process.
+    """
+    def __init__(self, solver=brute_force_cow_transport, size=1024, path=None):
+        """
+        solver - a transport solver taking (cows, limit), such as
+            brute_force_cow_transport
+        size - the largest number of allocations kept in memory
+        path - the name of the shelve file to keep all allocations in, or
+            None to keep them in memory only
+        """
+        self.solver = solver
+        self.size = size
+        self.recent = collections.OrderedDict()
+        self.store = shelve.open(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    def _store_key(self, key):
+        weights, limit = key
+        return '%s:%d:%s' % (self.solver.__name__, limit,
+                             ','.join(str(w) for w in weights))
+
+    def _remember(self, key, value):
+        self.recent[key] = value
+        self.recent.move_to_end(key)
+        if len(self.recent) > self.size:
+            self.recent.popitem(last=False)
+
+    def solve(self, cows, limit=10):
+        """
+        Returns the allocation of the solver for cows, a dictionary of name
+        (string), weight (int) pairs or a Herd, and limit (an int), from the
+        cache if a herd of the same weights was solved before.
+        """
+        key = (tuple(sorted(cows.values())), limit)
+        value = self.recent.get(key)
+        if value is None and self.store is not None:
+            value = self.store.get(self._store_key(key))
+        if value is None:
+            self.misses += 1
+            result = self.solver(cows, limit)
+            bound = getattr(result, 'lower_bound', None)
+            if bound is None:
+                bound = lower_bound(key[0], limit)
+            value = (tuple(tuple(cows[name] for name in trip)
+                           for trip in result), bound)
+            self._remember(key, value)
+            if self.store is not None:
+                self.store[self._store_key(key)] = value
+            return Allocation(result, bound)
+        self.hits += 1
+        self._remember(key, value)
+
+        # hand out the names of the cows of every weight to the trips
+        namesByWeight = {}
+        for name, weight in cows.items():
+            namesByWeight.setdefault(weight, []).append(name)
+        for names in namesByWeight.values():
+            names.reverse()
+        trips, bound = value
+        return Allocation([[namesByWeight[w].pop() for w in trip]
+                           for trip in trips], bound)
+
+    def close(self):
+        """Closes the shelve file, if any."""
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+
+# the cache used by cached_cow_transport
+_defaultCache = SolutionCache()
+
+
+def cached_cow_transport(cows, limit=10):
+    """
+    Finds the same allocation of cows as brute_force_cow_transport, but
+    only runs it once for every multiset of weights and limit, keeping the
+    most recently used allocations in memory.
+    Parameters:
+    cows - a dictionary of name (string), weight (int) pairs, or a Herd
+    limit - weight limit of the spaceship (an int)
+    Returns:
+    A list of lists, with each inner list containing the names of cows
+    transported on a particular trip and the overall list containing all the
+    trips
+    """
+    return _defaultCache.solve(cows, limit)
+
+
+#TESTING
+#print(cached_cow_transport({'Daisy': 50, 'Buttercup': 72, 'Betsy': 65}, 75))
+#print(cached_cow_transport({'Rose': 65, 'Coco': 50, 'Abby': 72}, 75))
+#[['Coco'], ['Abby'], ['Rose']]
@@ -0,0 +1,338 @@
+###########################
+# 6.00.2x Problem Set 1: Space Cows
+# Online transport of cows that keep arriving
+
+import collections.abc
+import random
+import time
+
+
+def stream_cows(source, follow=False, interval=1.0):
+    """
+    Reads comma-separated cow name, weight pairs one line at a time, in the
+    same format as load_cows, and yields them as soon as they are read
+    instead of building a dictionary of the whole herd.
+    Parameters:
+    source - the name of the data file as a string, or any iterable of lines
+    follow - if True, keep waiting for lines appended to the file once its
+        end is reached, like tail -f, instead of stopping there
+    interval - seconds to wait before looking for new lines again
+    Returns:
+    A generator of (name (string), weight (int)) pairs
+    """
+    if not isinstance(source, str):
+        for line in source:
+            if line.strip() != '':
+                line_data = line.split(',')
+                yield line_data[0], int(line_data[1])
+        return
+
+    with open(source, 'r') as f:
+        partial = ''
+        while True:
+            line = f.readline()
+            if line == '':
+                if not follow:
+                    break
+                time.sleep(interval)
+                continue
+            if follow and not line.endswith('\n'):
+                # the rest of the line has not been written yet
+                partial += line
+                continue
+            line, partial = partial + line, ''
+            if line.strip() != '':
+                line_data = line.split(',')
+                yield line_data[0], int(line_data[1])
+        if partial.strip() != '':
+            line_data = partial.split(',')
+            yield line_data[0], int(line_data[1])
+
+
+def _next_fit(cows, limit):
+    """
+    Keeps a single trip open and starts a new one whenever a cow does not
+    fit on it.
+    """
+    trip = []
+    room = limit
+    for name, weight in cows:
+        if weight > room:
+            yield trip
+            trip = []
+            room = limit
+        trip.append(name)
+        room -= weight
+    if trip != []:
+        yield trip
+
+
+class _Trip(object):
+    """
+    A node of a _RoomTree: an open trip, with the lowest number among the
+    trips of its subtree.
+    """
+    __slots__ = ('room', 'number', 'priority', 'left', 'right', 'lowest')
+
+    def __init__(self, room, number, priority):
+        self.room = room
+        self.number = number
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.lowest = number
+
+    def update(self):
+        self.lowest = self.number
+        if self.left is not None and self.left.lowest < self.lowest:
+            self.lowest = self.left.lowest
+        if self.right is not None and self.right.lowest < self.lowest:
+            self.lowest = self.right.lowest
+
+
+def _split(node, room, number):
+    # the trips before (room, number), and the others
+    if node is None:
+        return None, None
+    if (node.room, node.number) < (room, number):
+        node.right, right = _split(node.right, room, number)
+        node.update()
+        return node, right
+    left, node.left = _split(node.left, room, number)
+    node.update()
+    return left, node
+
+
+def _merge(left, right):
+    # the trips of left, all before those of right, and of right
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+def _insert(node, trip):
+    # the subtree of node with trip added
+    if node is None:
+        return trip
+    if trip.priority > node.priority:
+        trip.left, trip.right = _split(node, trip.room, trip.number)
+        trip.update()
+        return trip
+    if (trip.room, trip.number) < (node.room, node.number):
+        node.left = _insert(node.left, trip)
+    else:
+        node.right = _insert(node.right, trip)
+    if trip.lowest < node.lowest:
+        node.lowest = trip.lowest
+    return node
+
+
+def _delete(node, trip):
+    # the subtree of node, which holds trip, without it
+    if node is trip:
+        return _merge(node.left, node.right)
+    if (trip.room, trip.number) < (node.room, node.number):
+        node.left = _delete(node.left, trip)
+    else:
+        node.right = _delete(node.right, trip)
+    node.update()
+    return node
+
+
+class _RoomTree(object):
+    """
+    The open trips, indexed by the room they have left. The trips are the
+    nodes of a treap ordered by room and then number, so its size is the
+    number of open trips whatever the limit, and every node holds the lowest
+    number in its subtree, so the trips with at least a given room are
+    searched in expected logarithmic time.
+    """
+    def __init__(self):
+        self.root = None
+        # the shape of the tree only, never the trips, depends on it
+        self.random = random.Random(0)
+
+    def add(self, room, number):
+        """Adds the trip with the given number and room."""
+        trip = _Trip(room, number, self.random.random())
+        self.root = _insert(self.root, trip)
+
+    def _take(self, trip):
+        self.root = _delete(self.root, trip)
+        return trip.room, trip.number
+
+    def take_first(self, room):
+        """
+        Removes the trip with the lowest number among those with at least
+        the given room and returns (its room, its number), or None.
+        """
+        # on the way down, the lowest number among the trips and the right
+        # subtrees known to have enough room, and where it is
+        lowest = float('inf')
+        trip = subtree = None
+        node = self.root
+        while node is not None:
+            if node.room >= room:
+                if node.number < lowest:
+                    lowest, trip, subtree = node.number, node, None
+                if node.right is not None and node.right.lowest < lowest:
+                    lowest, trip, subtree = node.right.lowest, None, node.right
+                node = node.left
+            else:
+                node = node.right
+        if subtree is not None:
+            trip = subtree
+            while trip.number != lowest:
+                if trip.left is not None and trip.left.lowest == lowest:
+                    trip = trip.left
+                else:
+                    trip = trip.right
+        if trip is None:
+            return None
+        return self._take(trip)
+
+    def take_tightest(self, room):
+        """
+        Removes a trip with the least room among those with at least the
+        given room and returns (its room, its number), or None.
+        """
+        node = self.root
+        best = None
+        while node is not None:
+            if node.room >= room:
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        if best is None:
+            return None
+        return self._take(best)
+
+
+def _any_fit(cows, limit, best, max_open):
+    """
+    Puts every cow on the earliest opened trip with room for it, or on the
+    one with the least room that still fits it if best is True. The open
+    trips are kept in a _RoomTree. A trip is closed as soon as it is full,
+    or when more than max_open trips are open, in which case the one with
+    the least room left is closed.
+    """
+    rooms = _RoomTree()
+    trips = {}
+    opened = 0
+    for name, weight in cows:
+        if best:
+            taken = rooms.take_tightest(max(weight, 1))
+        else:
+            taken = rooms.take_first(max(weight, 1))
+        if taken is None:
+            room = limit
+            number = opened
+            opened += 1
+            trips[number] = []
+        else:
+            room, number = taken
+        trips[number].append(name)
+        room -= weight
+        if room == 0:
+            yield trips.pop(number)
+        else:
+            rooms.add(room, number)
+            if max_open is not None and len(trips) > max_open:
+                room, number = rooms.take_tightest(1)
+                yield trips.pop(number)
+    # the trips still open once the cows run out, earliest opened first
+    for number in sorted(trips):
+        yield trips[number]
+
+
+def _harmonic(cows, limit, classes):
+    """
+    Splits the cows into classes by weight: a cow heavier than limit/(j+1)
+    but no heavier than limit/j belongs to class j for j < classes, and every
+    lighter cow to the last class. A trip of class j takes exactly j cows,
+    and the last class is packed next fit, so only one trip per class is
+    ever open.
+    """
+    trips = [[] for j in range(classes + 1)]
+    rooms = [limit] * (classes + 1)
+    for name, weight in cows:
+        j = classes if weight * classes <= limit else limit // weight
+        if j < classes:
+            trips[j].append(name)
+            if len(trips[j]) == j:
+                yield trips[j]
+                trips[j] = []
+        else:
+            if weight > rooms[j]:
+                yield trips[j]
+                trips[j] = []
+                rooms[j] = limit
+            trips[j].append(name)
+            rooms[j] -= weight
+    for trip in trips:
+        if trip != []:
+            yield trip
+
+
+def online_cow_transport(cows, limit=10, method='first_fit', max_open=None,
+                         classes=4):
+    """
+    Assigns every cow to a trip as soon as it arrives and yields each trip
+    as soon as it is closed, so that the cows can keep coming while the
+    earlier trips are already on their way. Only the open trips are kept in
+    memory, never the whole herd.
+    The method can be:
+    'next_fit' - keep one trip open and close it when the next cow does not fit
+    'first_fit' - put the cow on the earliest opened trip that fits it
+    'best_fit' - put the cow on the trip with the least room that fits it
+    'harmonic' - keep one trip open for each class of cow weights, see
+        _harmonic; classes is the number of classes
+    For 'first_fit' and 'best_fit', max_open bounds the number of open trips;
+    by default trips are only closed once full or when the cows run out.
+    Their open trips are kept in a tree indexed by the room left, of a size
+    proportional to the number of open trips, so each cow takes expected
+    O(log open trips) time.
+    Parameters:
+    cows - an iterable of (name (string), weight (int)) pairs, like the
+        generator returned by stream_cows, or a dictionary of name, weight
+        pairs or a Herd
+    limit - weight limit of the spaceship (an int)
+    method - 'next_fit', 'first_fit' (the default), 'best_fit' or 'harmonic'
+    max_open - the largest number of trips open at once, or None
+    classes - number of weight classes for 'harmonic' (an int > 0)
+    Returns:
+    A generator of lists, each containing the names of cows transported on
+    one trip
+    Raises ValueError if some cow is heavier than the limit.
+    """
+    if isinstance(cows, collections.abc.Mapping):
+        cows = cows.items()
+    if method not in ('next_fit', 'first_fit', 'best_fit', 'harmonic'):
+        raise ValueError('unknown method ' + repr(method))
+
+    def checked(cows):
+        for name, weight in cows:
+            if weight > limit:
+                raise ValueError('cow ' + repr(name)
+                                 + ' is heavier than the weight limit')
+            yield name, weight
+
+    if method == 'next_fit':
+        return _next_fit(checked(cows), limit)
+    elif method == 'harmonic':
+        return _harmonic(checked(cows), limit, classes)
+    return _any_fit(checked(cows), limit, method == 'best_fit', max_open)
+
+
+#TESTING
+#for trip in online_cow_transport(stream_cows("ps1_cow_data.txt"), 10):
+    #print(trip)
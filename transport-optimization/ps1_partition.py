@@ -19,6 +19,56 @@ def get_partitions(set_):
     for partition in partitions(set_):
         yield [list(elt) for elt in partition]
 
+def feasible_partitions(set_, block_ok=None):
+    """
+    Walk all partitions of set_ as restricted-growth strings: the i-th item
+    goes into one of the blocks already started or into a new block after
+    them, so every partition is produced exactly once. block_ok is called
+    with a block right after an item has been added to it, and if it returns
+    False no partition containing that block is visited at all.
+    The same list of blocks is yielded every time and changed in place while
+    walking, so copy it if you want to keep a partition.
+    """
+    items = list(set_)
+    n = len(items)
+    if n == 0:
+        yield []
+        return
+    blocks = []
+    # block index of every item, -1 for items not placed yet
+    choice = [-1] * n
+    i = 0
+    while i >= 0:
+        c = choice[i]
+        if c >= 0:
+            # take item i back out of the block it was in
+            blocks[c].pop()
+            if not blocks[c]:
+                blocks.pop()
+        c += 1
+        while c <= len(blocks):
+            if c == len(blocks):
+                blocks.append([items[i]])
+            else:
+                blocks[c].append(items[i])
+            if block_ok is None or block_ok(blocks[c]):
+                break
+            blocks[c].pop()
+            if not blocks[c]:
+                blocks.pop()
+            c += 1
+        if c > len(blocks):
+            # no block left for item i, go back to the previous item
+            choice[i] = -1
+            i -= 1
+        else:
+            choice[i] = c
+            if i == n - 1:
+                yield blocks
+            else:
+                i += 1
+
+
 ### Uncomment the following code  and run this file
 ### to see what get_partitions does if you want to visualize it:
 
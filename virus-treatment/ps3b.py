@@ -1,8 +1,6 @@
 # Problem Set 3: Simulating the Spread of Disease and Virus Population Dynamics 
 
 import random
-import pylab
-import numpy
 
 ''' 
 Begin helper code
@@ -202,7 +200,8 @@ def simulationWithoutDrug(numViruses, maxPop, maxBirthProb, clearProb,
     clearProb: Maximum clearance probability (a float between 0-1)
     numTrials: number of simulation runs to execute (an integer)
     """
-    
+    import pylab
+
     virusesList = []
     for i in range(numViruses):
         virusesList.append(SimpleVirus(maxBirthProb, clearProb))
@@ -543,6 +542,8 @@ def simulationWithDrug(numViruses, maxPop, maxBirthProb, clearProb, resistances,
     numTrials: number of simulation runs to execute (an integer)
     
     """
+    import pylab
+
     virusesList = []
     for i in range(numViruses):
         virusesList.append(ResistantVirus(maxBirthProb, clearProb, resistances, mutProb)) 
@@ -577,15 +578,16 @@ def simulationWithDrug(numViruses, maxPop, maxBirthProb, clearProb, resistances,
     
 
 #TESTING
-numViruses = 100
-maxPop = 1000
-maxBirthProb = 0.1
-clearProb = 0.05
-resistances = {'guttagonol': False}
-mutProb = 0.005
-numTrials = 5
-print(simulationWithDrug(numViruses, maxPop, maxBirthProb, clearProb, resistances,
-                      mutProb, numTrials))
+if __name__ == '__main__':
+    numViruses = 100
+    maxPop = 1000
+    maxBirthProb = 0.1
+    clearProb = 0.05
+    resistances = {'guttagonol': False}
+    mutProb = 0.005
+    numTrials = 5
+    print(simulationWithDrug(numViruses, maxPop, maxBirthProb, clearProb, resistances,
+                          mutProb, numTrials))
 
 #print(simulationWithDrug(1, 10, 1.0, 0.0, {}, 1.0, 5))
 #print(simulationWithDrug(1, 20, 1.0, 0.0, {"guttagonol": True}, 1.0, 5))